@@ -1,8 +1,13 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 from typing import Optional
 import os
 
 
+# Valid compression_level values per compression_algorithm
+COMPRESSION_LEVELS = {"zstd": range(1, 23), "zlib": range(0, 10)}
+
+
 class Settings(BaseSettings):
     # API Configuration
     api_title: str = "Echo Notes API"
@@ -14,17 +19,56 @@ class Settings(BaseSettings):
 
     # OpenAI Configuration
     openai_api_key: Optional[str] = None
+    openai_api_base: str = "https://api.openai.com/v1"
 
     # ElevenLabs Configuration
     elevenlabs_api_key: Optional[str] = None
+    elevenlabs_api_base: str = "https://api.elevenlabs.io/v1"
 
     # Whisper Configuration
     whisper_model: str = "base"
     max_audio_duration: int = 300  # 5 minutes in seconds
+    # Memory-map weights from a checkpoint in whisper_weights_dir so that
+    # uvicorn workers share one copy through the page cache
+    whisper_shared_weights: bool = False
+    whisper_weights_dir: str = "./data/models"
+    # CPU inference engine: pytorch, pytorch_int8 or ctranslate2
+    transcription_backend: str = "pytorch"
+    whisper_cpu_threads: int = 0  # 0 keeps the runtime default
+    whisper_compute_type: str = "int8"  # ctranslate2 only
+
+    # Overflow routing to a remote speech-to-text provider (openai, elevenlabs)
+    transcription_overflow_provider: Optional[str] = None
+    local_transcription_concurrency: int = 1
+    overflow_queue_wait_threshold: float = 5.0  # seconds
+    overflow_max_error_rate: float = 0.5
+    overflow_error_cooldown: float = 30.0  # seconds before retrying a failing provider
+    remote_transcription_timeout: float = 120.0
+    remote_transcription_concurrency: int = 4
+
+    # Note text compression: zstd or zlib
+    compression_algorithm: str = "zstd"
+    compression_level: int = 6
+    compression_threshold: int = 4096  # bytes; smaller values stay plain text
 
     # Storage Configuration
     upload_dir: str = "./data/uploads"
     max_file_size: int = 50 * 1024 * 1024  # 50MB
+    upload_chunk_size: int = 4 * 1024 * 1024  # recommended resumable chunk size
+    upload_session_ttl: int = 24 * 60 * 60  # seconds before unfinished uploads expire
+
+    # Admission control (costs are estimated seconds of work)
+    admission_enabled: bool = True
+    transcribe_capacity_seconds: float = 300.0
+    summarize_capacity_seconds: float = 120.0
+    admission_queue_factor: float = 1.0  # queued cost limit, x capacity
+    admission_max_queue_wait: float = 10.0  # seconds
+    admission_session_limit: int = 2  # queued + in-flight per session
+    admission_batch_share: float = 0.5  # capacity share usable by batch
+    whisper_realtime_factor: float = 0.5  # processing seconds per audio second
+    # Fallback when the duration cannot be probed: ~128 kbps compressed audio
+    admission_audio_bytes_per_second: int = 16000
+    llm_seconds_per_1k_tokens: float = 10.0
 
     # CORS Configuration
     allowed_origins: list = [
@@ -49,6 +93,31 @@ class Settings(BaseSettings):
     # Logging
     log_level: str = "INFO"
     log_file: Optional[str] = None
+    log_format: str = "text"  # text or json
+    # Fraction of DEBUG/INFO records kept per logger-name prefix,
+    # e.g. {"echo_notes.request": 0.1, "uvicorn.access": 0.1}
+    log_sample_rates: dict[str, float] = {}
+
+    # Deployment role: "all" serves everything, "api" serves notes only and
+    # never imports the inference stack, "inference" serves transcribe/summarize
+    service_role: str = "all"
+
+    @model_validator(mode="after")
+    def check_compression(self):
+        """Reject compression settings every large note write would fail on"""
+        levels = COMPRESSION_LEVELS.get(self.compression_algorithm)
+        if levels is None:
+            raise ValueError(
+                f"Unknown compression_algorithm '{self.compression_algorithm}'. "
+                f"Expected one of: {', '.join(COMPRESSION_LEVELS)}"
+            )
+        if self.compression_level not in levels:
+            raise ValueError(
+                f"compression_level for {self.compression_algorithm} must be "
+                f"between {levels.start} and {levels.stop - 1}, "
+                f"got {self.compression_level}"
+            )
+        return self
 
     class Config:
         env_file = ".env"
@@ -57,6 +126,3 @@ class Settings(BaseSettings):
 
 # Create settings instance
 settings = Settings()
-
-# Ensure upload directory exists
-os.makedirs(settings.upload_dir, exist_ok=True)
@@ -1,42 +1,234 @@
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 from .config import settings
 
+# Request-scoped context attached to every log record
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+stage_timings_var: ContextVar[Optional[dict]] = ContextVar(
+    "stage_timings", default=None
+)
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request id to records"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of DEBUG/INFO records for configured loggers
+
+    Rates are matched on the longest logger-name prefix, so
+    {"echo_notes.notes_router": 0.1} samples that logger and its children.
+    Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates: dict):
+        super().__init__()
+        # Longest prefix first
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                return random.random() < rate
+        return True
+
+
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves only handler output formatting to the listener
+
+    The message and traceback are rendered on the calling thread, so a log
+    line shows argument values as they were at the call and no argument's
+    __str__/__repr__ runs concurrently with its owner. Unlike the stock
+    QueueHandler, the record keeps its extra= fields and is not formatted
+    with the output formatter here, so JsonFormatter still sees them on the
+    listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with request id and any extra= fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = datetime.fromtimestamp(record.created, timezone.utc)
+        entry = {
+            "timestamp": timestamp.isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
 
 def setup_logging():
     """Configure logging for the application"""
-
-    # Create logs directory if it doesn't exist
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    global _listener
 
     # Configure logging format
     log_format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    if settings.log_format == "json":
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(log_format)
 
-    # Configure root logger
-    logging.basicConfig(
-        level=getattr(logging, settings.log_level.upper()),
-        format=log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            (
-                logging.FileHandler(log_dir / "app.log")
-                if settings.log_file
-                else logging.NullHandler()
-            ),
-        ],
-    )
-
-    # Set specific loggers
-    logging.getLogger("uvicorn").setLevel(logging.INFO)
-    logging.getLogger("uvicorn.access").setLevel(logging.INFO)
+    # Output handlers run on the listener thread, off the event loop
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if settings.log_file:
+        log_path = Path(settings.log_file)
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(logging.FileHandler(log_path))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = RecordQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+    queue_handler.addFilter(SamplingFilter(settings.log_sample_rates))
+
+    shutdown_logging()
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(getattr(logging, settings.log_level.upper()))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+
+    # Set specific loggers; route uvicorn's own handlers through the queue too
+    for name in ("uvicorn", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.setLevel(logging.INFO)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
 
     # Create logger for this application
     logger = logging.getLogger("echo_notes")
     logger.info("Logging configured successfully")
 
 
+def shutdown_logging():
+    """
+    Flush queued records and stop the listener thread
+
+    The output handlers are then attached to the root logger directly, so
+    records logged afterwards (uvicorn's shutdown messages, for one) are
+    still written instead of piling up in a queue nobody drains.
+    """
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, logging.handlers.QueueHandler):
+                root.removeHandler(handler)
+        for handler in _listener.handlers:
+            root.addHandler(handler)
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a specific module"""
     return logging.getLogger(f"echo_notes.{name}")
+
+
+@contextmanager
+def timed_stage(name: str):
+    """Record how long a block took in the current request's stage timings"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = stage_timings_var.get()
+        if stages is not None:
+            stages[name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware that assigns a request id and logs one structured record
+    per request with its status, duration and stage timings
+
+    The id is taken from the X-Request-ID header when present and echoed back
+    on the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.logger = get_logger("request")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = dict(scope["headers"]).get(b"x-request-id", b"").decode()
+        request_id = request_id or uuid.uuid4().hex
+        stages = {}
+        request_id_token = request_id_var.set(request_id)
+        stages_token = stage_timings_var.set(stages)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            self.logger.info(
+                "%s %s %s",
+                scope["method"],
+                scope["path"],
+                status_code,
+                extra={
+                    "status_code": status_code,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                    "stages": stages or None,
+                },
+            )
+            request_id_var.reset(request_id_token)
+            stage_timings_var.reset(stages_token)
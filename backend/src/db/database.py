@@ -1,8 +1,8 @@
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, select, update
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
-from .models import Base
+from .models import Base, Note
 from ..core.config import settings
 from ..core.logging import get_logger
 
@@ -27,12 +27,40 @@ async def init_db():
     try:
         # Create all tables
         Base.metadata.create_all(bind=engine)
+        _migrate_notes()
         logger.info("Database initialized successfully")
     except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
+        logger.error("Failed to initialize database: %s", e)
         raise
 
 
+def _migrate_notes():
+    """Bring notes tables created by older versions up to date"""
+    # create_all does not add indexes to existing tables
+    for index in Note.__table__.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+    # updated_at used to be set only on update. Copy created_at through the
+    # DateTime type rather than in SQL so SQLite stores the same string format
+    # as new rows and range comparisons on updated_at stay correct.
+    notes = Note.__table__
+    with engine.begin() as connection:
+        rows = connection.execute(
+            select(notes.c.id, notes.c.created_at).where(notes.c.updated_at.is_(None))
+        ).all()
+        if rows:
+            connection.execute(
+                update(notes)
+                .where(notes.c.id == bindparam("note_id"))
+                .values(updated_at=bindparam("backfill_updated_at")),
+                [
+                    {"note_id": row.id, "backfill_updated_at": row.created_at}
+                    for row in rows
+                ],
+            )
+            logger.info("Backfilled updated_at for %s notes", len(rows))
+
+
 def get_db():
     """Dependency to get database session"""
     db = SessionLocal()
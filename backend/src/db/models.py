@@ -1,29 +1,62 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float
+from sqlalchemy import (
+    Column,
+    Integer,
+    String,
+    DateTime,
+    Boolean,
+    Float,
+    BigInteger,
+    ForeignKey,
+)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
-from datetime import datetime
+from datetime import datetime, timezone
+from .types import CompressedText
 
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class Note(Base):
     __tablename__ = "notes"
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
-    content = Column(Text, nullable=True)
+    # Large text is compressed at rest and deferred: it is only fetched and
+    # decompressed when accessed, or when a query undefers the "body" group
+    content = deferred(Column(CompressedText, nullable=True), group="body")
     audio_url = Column(String(500), nullable=True)
-    transcript = Column(Text, nullable=True)
-    summary = Column(Text, nullable=True)
+    transcript = deferred(Column(CompressedText, nullable=True), group="body")
+    summary = deferred(Column(CompressedText, nullable=True), group="body")
     confidence = Column(Float, nullable=True)
     duration = Column(Float, nullable=True)  # in seconds
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set on insert as well as update so it can version every row for ETags and
+    # sync deltas. Python-side so it keeps sub-second precision on SQLite.
+    updated_at = Column(
+        DateTime(timezone=True), default=utcnow, onupdate=utcnow, index=True
+    )
 
     def __repr__(self):
         return f"<Note(id={self.id}, title='{self.title}')>"
 
 
+class NoteTombstone(Base):
+    """Records a deleted note so /notes/changes can report the deletion"""
+
+    __tablename__ = "note_tombstones"
+
+    note_id = Column(Integer, primary_key=True)
+    deleted_at = Column(DateTime(timezone=True), default=utcnow, index=True)
+
+    def __repr__(self):
+        return f"<NoteTombstone(note_id={self.note_id})>"
+
+
 class Session(Base):
     __tablename__ = "sessions"
 
@@ -36,3 +69,35 @@ class Session(Base):
 
     def __repr__(self):
         return f"<Session(id={self.id}, session_id='{self.session_id}')>"
+
+
+class Upload(Base):
+    """Resumable upload session; chunks are written into a preallocated file"""
+
+    __tablename__ = "uploads"
+
+    id = Column(String(36), primary_key=True)
+    filename = Column(String(255), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=True)  # optional whole-file checksum
+    status = Column(String(20), nullable=False, default="pending")
+    file_path = Column(String(500), nullable=True)  # set once finalized
+    created_at = Column(DateTime(timezone=True), default=utcnow)
+
+    def __repr__(self):
+        return f"<Upload(id={self.id}, filename='{self.filename}')>"
+
+
+class UploadChunk(Base):
+    __tablename__ = "upload_chunks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    upload_id = Column(
+        String(36), ForeignKey("uploads.id", ondelete="CASCADE"), index=True
+    )
+    offset = Column(BigInteger, nullable=False)
+    length = Column(BigInteger, nullable=False)
+    sha256 = Column(String(64), nullable=False)
+
+    def __repr__(self):
+        return f"<UploadChunk(upload_id={self.upload_id}, offset={self.offset})>"
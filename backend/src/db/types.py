@@ -0,0 +1,76 @@
+import zlib
+from typing import Optional, Union
+from sqlalchemy import Text
+from sqlalchemy.types import TypeDecorator
+from ..core.config import settings
+
+try:
+    import zstandard
+except ImportError:  # declared dependency; fall back to zlib for writes if absent
+    zstandard = None
+
+# Compressed values are stored as bytes starting with a 4-byte header naming
+# the codec; anything else (including every value written before compression
+# existed) is plain text
+ZLIB_HEADER = b"\x00EZ1"
+ZSTD_HEADER = b"\x00ES1"
+
+
+def compress_text(value: str) -> Union[str, bytes]:
+    """
+    Compress text at or above settings.compression_threshold bytes
+
+    Shorter values, and values that do not shrink, are returned unchanged so
+    they stay plain, searchable text in the database.
+    """
+    raw = value.encode("utf-8")
+    if len(raw) < settings.compression_threshold:
+        return value
+
+    if settings.compression_algorithm == "zstd" and zstandard is not None:
+        compressed = ZSTD_HEADER + zstandard.ZstdCompressor(
+            level=settings.compression_level
+        ).compress(raw)
+    else:
+        # Settings validates the level for the configured codec; zstd levels
+        # go higher than zlib's when falling back
+        level = min(settings.compression_level, 9)
+        compressed = ZLIB_HEADER + zlib.compress(raw, level)
+
+    return compressed if len(compressed) < len(raw) else value
+
+
+def decompress_text(value: Union[str, bytes, None]) -> Optional[str]:
+    """Inverse of compress_text; plain text passes through"""
+    if value is None or isinstance(value, str):
+        return value
+
+    header, payload = bytes(value[:4]), value[4:]
+    if header == ZLIB_HEADER:
+        return zlib.decompress(payload).decode("utf-8")
+    if header == ZSTD_HEADER:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed text")
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    return bytes(value).decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text column that transparently compresses large values
+
+    Values above the threshold are stored as compressed bytes in the same
+    column (SQLite keeps them as BLOBs); smaller ones stay plain text, so
+    existing rows need no migration to be readable.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return compress_text(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
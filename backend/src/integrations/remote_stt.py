@@ -0,0 +1,157 @@
+import mimetypes
+from pathlib import Path
+from typing import Optional
+import httpx
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..services.transcription import confidence_from_logprobs
+from ..utils.languages import normalize_language
+
+logger = get_logger("remote_stt")
+
+
+class RemoteSpeechToText:
+    """
+    Base class for hosted speech-to-text providers
+
+    transcribe() returns the same dict shape as
+    TranscriptionService.transcribe_audio: text, confidence, language (as a
+    Whisper language code), duration.
+    """
+
+    name = "remote"
+
+    def __init__(self, api_key: Optional[str], base_url: str):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self._client = None
+
+    def is_configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the shared HTTP client"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=settings.remote_transcription_timeout,
+            )
+        return self._client
+
+    async def transcribe(
+        self, audio_file_path: str, language: Optional[str] = None
+    ) -> dict:
+        raise NotImplementedError
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @staticmethod
+    def _audio_file(audio_file_path: str) -> tuple:
+        path = Path(audio_file_path)
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        return (path.name, open(path, "rb"), content_type)
+
+
+class OpenAISpeechToText(RemoteSpeechToText):
+    """OpenAI audio transcription API (hosted Whisper)"""
+
+    name = "openai"
+
+    def __init__(self):
+        super().__init__(settings.openai_api_key, settings.openai_api_base)
+
+    async def transcribe(
+        self, audio_file_path: str, language: Optional[str] = None
+    ) -> dict:
+        data = {"model": "whisper-1", "response_format": "verbose_json"}
+        if language:
+            data["language"] = language
+
+        filename, file, content_type = self._audio_file(audio_file_path)
+        with file:
+            response = await self._get_client().post(
+                "/audio/transcriptions",
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                data=data,
+                files={"file": (filename, file, content_type)},
+            )
+        response.raise_for_status()
+        result = response.json()
+
+        segments = result.get("segments") or []
+        return {
+            "text": result["text"].strip(),
+            "confidence": confidence_from_logprobs(
+                [seg.get("avg_logprob", 0) for seg in segments]
+            ),
+            # verbose_json reports a name ("english"), Whisper a code ("en")
+            "language": normalize_language(result.get("language") or language),
+            "duration": result.get("duration"),
+        }
+
+
+class ElevenLabsSpeechToText(RemoteSpeechToText):
+    """ElevenLabs speech-to-text API"""
+
+    name = "elevenlabs"
+
+    def __init__(self):
+        super().__init__(settings.elevenlabs_api_key, settings.elevenlabs_api_base)
+
+    async def transcribe(
+        self, audio_file_path: str, language: Optional[str] = None
+    ) -> dict:
+        data = {"model_id": "scribe_v1"}
+        if language:
+            data["language_code"] = language
+
+        filename, file, content_type = self._audio_file(audio_file_path)
+        with file:
+            response = await self._get_client().post(
+                "/speech-to-text",
+                headers={"xi-api-key": self.api_key},
+                data=data,
+                files={"file": (filename, file, content_type)},
+            )
+        response.raise_for_status()
+        result = response.json()
+
+        words = [w for w in result.get("words") or [] if w.get("type") == "word"]
+        logprobs = [w["logprob"] for w in words if "logprob" in w]
+        if logprobs:
+            confidence = confidence_from_logprobs(logprobs)
+        else:
+            confidence = float(result.get("language_probability") or 0.0)
+
+        return {
+            "text": result["text"].strip(),
+            "confidence": confidence,
+            "language": normalize_language(result.get("language_code") or language),
+            "duration": words[-1].get("end") if words else None,
+        }
+
+
+PROVIDERS = {
+    OpenAISpeechToText.name: OpenAISpeechToText,
+    ElevenLabsSpeechToText.name: ElevenLabsSpeechToText,
+}
+
+
+def create_remote_provider(name: Optional[str]) -> Optional[RemoteSpeechToText]:
+    """Create the configured overflow provider, or None when disabled"""
+    if not name:
+        return None
+    if name not in PROVIDERS:
+        raise ValueError(
+            f"Unknown speech-to-text provider '{name}'. "
+            f"Expected one of: {', '.join(PROVIDERS)}"
+        )
+
+    provider = PROVIDERS[name]()
+    if not provider.is_configured():
+        logger.warning("%s API key not configured, overflow routing disabled", name)
+        return None
+    return provider
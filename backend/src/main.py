@@ -1,12 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from importlib import import_module
 import uvicorn
 
 from .core.config import settings
-from .core.logging import setup_logging
+from .core.logging import RequestContextMiddleware, setup_logging, shutdown_logging
 from .db.database import init_db
-from .routers import transcribe, summarize, notes
+from .utils.memory import get_memory_stats
+
+# Routers served by each deployment role. Router modules are imported only
+# when their role is enabled, so an "api" replica never loads the inference
+# stack (Whisper/torch, LangChain).
+ROLE_ROUTERS = {
+    "api": ["notes"],
+    "inference": ["transcribe", "summarize"],
+}
+ROLE_ROUTERS["all"] = ROLE_ROUTERS["inference"] + ROLE_ROUTERS["api"]
 
 
 @asynccontextmanager
@@ -17,7 +27,11 @@ async def lifespan(app: FastAPI):
     await init_db()
     yield
     # Shutdown
-    pass
+    if "transcribe" in ROLE_ROUTERS[settings.service_role]:
+        from .services.transcription_routing import transcription_router
+
+        await transcription_router.close()
+    shutdown_logging()
 
 
 app = FastAPI(
@@ -34,12 +48,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
 
+# Request id and per-request structured log record (outermost middleware)
+app.add_middleware(RequestContextMiddleware)
+
 # Include routers
-app.include_router(transcribe.router, prefix="/api", tags=["transcribe"])
-app.include_router(summarize.router, prefix="/api", tags=["summarize"])
-app.include_router(notes.router, prefix="/api", tags=["notes"])
+if settings.service_role not in ROLE_ROUTERS:
+    raise ValueError(
+        f"Unknown service_role '{settings.service_role}'. "
+        f"Expected one of: {', '.join(ROLE_ROUTERS)}"
+    )
+
+for router_name in ROLE_ROUTERS[settings.service_role]:
+    router_module = import_module(f".routers.{router_name}", __package__)
+    app.include_router(router_module.router, prefix="/api", tags=[router_name])
 
 
 @app.get("/")
@@ -49,7 +73,15 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "role": settings.service_role}
+
+
+@app.get("/health/memory")
+async def memory_check():
+    """Memory usage of the worker that served this request"""
+    stats = get_memory_stats()
+    stats["whisper_shared_weights"] = settings.whisper_shared_weights
+    return stats
 
 
 if __name__ == "__main__":
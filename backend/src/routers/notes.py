@@ -1,10 +1,25 @@
-from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session, undefer_group
 from typing import List, Optional
 from ..db.database import get_db
-from ..db.models import Note
-from ..schemas.notes import NoteCreate, NoteUpdate, NoteResponse, NoteListResponse
+from ..db.models import Note, NoteTombstone, utcnow
+from ..schemas.notes import (
+    NoteCreate,
+    NoteUpdate,
+    NoteResponse,
+    NoteListResponse,
+    NoteChangesResponse,
+)
 from ..core.logging import get_logger
+from ..utils.http_cache import (
+    as_utc,
+    cache_headers,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
 
 logger = get_logger("notes_router")
 router = APIRouter()
@@ -23,37 +38,53 @@ async def create_note(note: NoteCreate, db: Session = Depends(get_db)):
         )
 
         db.add(db_note)
+        db.flush()
+        # SQLite may reuse the ID of the most recently deleted note
+        db.query(NoteTombstone).filter(NoteTombstone.note_id == db_note.id).delete()
         db.commit()
         db.refresh(db_note)
 
-        logger.info(f"Created note with ID: {db_note.id}")
+        logger.info("Created note with ID: %s", db_note.id)
         return NoteResponse.from_orm(db_note)
 
     except Exception as e:
         db.rollback()
-        logger.error(f"Failed to create note: {e}")
+        logger.error("Failed to create note: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/notes", response_model=NoteListResponse)
 async def get_notes(
+    request: Request,
+    response: Response,
     page: int = Query(1, ge=1),
     size: int = Query(10, ge=1, le=100),
     db: Session = Depends(get_db),
 ):
     """Get all notes with pagination"""
     try:
+        # The row count and newest updated_at version the whole collection;
+        # both come from one cheap aggregate over the updated_at index. No
+        # Last-Modified: a delete changes the count but not max(updated_at),
+        # so If-Modified-Since alone would miss it.
+        total, newest = db.query(func.count(Note.id), func.max(Note.updated_at)).one()
+        etag = make_etag("notes", page, size, total, as_utc(newest))
+
+        if is_not_modified(request, etag, None):
+            return not_modified_response(etag, None)
+
         offset = (page - 1) * size
 
         notes = (
             db.query(Note)
+            .options(undefer_group("body"))
             .order_by(Note.created_at.desc())
             .offset(offset)
             .limit(size)
             .all()
         )
-        total = db.query(Note).count()
 
+        response.headers.update(cache_headers(etag, None))
         return NoteListResponse(
             notes=[NoteResponse.from_orm(note) for note in notes],
             total=total,
@@ -62,25 +93,106 @@ async def get_notes(
         )
 
     except Exception as e:
-        logger.error(f"Failed to get notes: {e}")
+        logger.error("Failed to get notes: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/notes/changes", response_model=NoteChangesResponse)
+async def get_note_changes(
+    since: datetime = Query(..., description="Return notes changed after this time"),
+    after_id: Optional[int] = Query(
+        None, description="Tie-breaker: skip notes changed exactly at since up to this ID"
+    ),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """
+    Get notes created or updated after a timestamp, oldest change first
+
+    Pass the returned next_since and next_after_id to fetch the following
+    batch. deleted_ids lists notes deleted within the same window.
+    """
+    try:
+        since = as_utc(since)
+        changed = Note.updated_at > since
+        if after_id is not None:
+            changed = changed | ((Note.updated_at == since) & (Note.id > after_id))
+
+        notes = (
+            db.query(Note)
+            .options(undefer_group("body"))
+            .filter(changed)
+            .order_by(Note.updated_at.asc(), Note.id.asc())
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(notes) > limit
+        notes = notes[:limit]
+
+        next_since = as_utc(notes[-1].updated_at) if notes else since
+        next_after_id = notes[-1].id if notes else after_id
+
+        # Deletions up to the end of this batch; the next batch starts after it
+        deleted = db.query(NoteTombstone).filter(NoteTombstone.deleted_at > since)
+        if has_more:
+            deleted = deleted.filter(NoteTombstone.deleted_at <= next_since)
+        deleted = deleted.order_by(NoteTombstone.deleted_at).all()
+
+        # Move the cursor past deletions newer than every changed note so
+        # they are not reported again
+        if deleted and as_utc(deleted[-1].deleted_at) > next_since:
+            next_since = as_utc(deleted[-1].deleted_at)
+            next_after_id = None
+
+        return NoteChangesResponse(
+            notes=[NoteResponse.from_orm(note) for note in notes],
+            deleted_ids=[tombstone.note_id for tombstone in deleted],
+            next_since=next_since,
+            next_after_id=next_after_id,
+            has_more=has_more,
+        )
+
+    except Exception as e:
+        logger.error("Failed to get note changes since %s: %s", since, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/notes/{note_id}", response_model=NoteResponse)
-async def get_note(note_id: int, db: Session = Depends(get_db)):
+async def get_note(
+    note_id: int, request: Request, response: Response, db: Session = Depends(get_db)
+):
     """Get a specific note by ID"""
     try:
-        note = db.query(Note).filter(Note.id == note_id).first()
+        # Check validators against the version columns before loading the row
+        version = (
+            db.query(Note.updated_at, Note.created_at)
+            .filter(Note.id == note_id)
+            .first()
+        )
 
-        if not note:
+        if not version:
             raise HTTPException(status_code=404, detail="Note not found")
 
+        last_modified = version.updated_at or version.created_at
+        etag = make_etag("note", note_id, as_utc(last_modified))
+
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+
+        note = (
+            db.query(Note)
+            .options(undefer_group("body"))
+            .filter(Note.id == note_id)
+            .first()
+        )
+
+        response.headers.update(cache_headers(etag, last_modified))
         return NoteResponse.from_orm(note)
 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Failed to get note {note_id}: {e}")
+        logger.error("Failed to get note %s: %s", note_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -103,14 +215,14 @@ async def update_note(
         db.commit()
         db.refresh(db_note)
 
-        logger.info(f"Updated note with ID: {note_id}")
+        logger.info("Updated note with ID: %s", note_id)
         return NoteResponse.from_orm(db_note)
 
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"Failed to update note {note_id}: {e}")
+        logger.error("Failed to update note %s: %s", note_id, e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -124,14 +236,15 @@ async def delete_note(note_id: int, db: Session = Depends(get_db)):
             raise HTTPException(status_code=404, detail="Note not found")
 
         db.delete(db_note)
+        db.merge(NoteTombstone(note_id=note_id, deleted_at=utcnow()))
         db.commit()
 
-        logger.info(f"Deleted note with ID: {note_id}")
+        logger.info("Deleted note with ID: %s", note_id)
         return {"message": "Note deleted successfully"}
 
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
-        logger.error(f"Failed to delete note {note_id}: {e}")
+        logger.error("Failed to delete note %s: %s", note_id, e)
         raise HTTPException(status_code=500, detail=str(e))
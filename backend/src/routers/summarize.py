@@ -1,28 +1,48 @@
+import json
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from ..db.database import get_db
 from ..services.summarization import summarization_service
+from ..services.admission import (
+    AdmissionRejected,
+    estimate_summarization_cost,
+    get_request_priority,
+    get_session_key,
+    summarization_admission,
+)
 from ..schemas.transcription import SummarizationRequest, SummarizationResponse
-from ..core.logging import get_logger
+from ..core.logging import get_logger, timed_stage
 
 logger = get_logger("summarize_router")
 router = APIRouter()
 
 
 @router.post("/summarize", response_model=SummarizationResponse)
-async def summarize_text(request: SummarizationRequest, db: Session = Depends(get_db)):
+async def summarize_text(
+    request: SummarizationRequest,
+    db: Session = Depends(get_db),
+    priority: str = Depends(get_request_priority),
+    session_key: Optional[str] = Depends(get_session_key),
+):
     """
     Summarize text using LangChain and OpenAI
     """
     try:
         logger.info(
-            f"Processing summarization request. Text length: {len(request.text)}"
+            "Processing summarization request. Text length: %s", len(request.text)
         )
 
         # Summarize text
-        result = await summarization_service.summarize_text(
-            text=request.text, max_length=request.max_length, style=request.style
-        )
+        cost = estimate_summarization_cost(request.text)
+        async with summarization_admission.admit(cost, priority, session_key):
+            with timed_stage("summarize"):
+                result = await summarization_service.summarize_text(
+                    text=request.text,
+                    max_length=request.max_length,
+                    style=request.style,
+                )
 
         logger.info("Summarization completed successfully")
 
@@ -33,6 +53,75 @@ async def summarize_text(request: SummarizationRequest, db: Session = Depends(ge
             original_length=result["original_length"],
         )
 
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
-        logger.error(f"Summarization failed: {e}")
+        logger.error("Summarization failed: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format a server-sent event frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/summarize/stream")
+async def summarize_text_stream(
+    request: SummarizationRequest,
+    db: Session = Depends(get_db),
+    priority: str = Depends(get_request_priority),
+    session_key: Optional[str] = Depends(get_session_key),
+):
+    """
+    Summarize text, streaming the summary over server-sent events
+
+    Emits "token" events as the summary is generated, then a "key_points"
+    event and a final "summary" event shaped like SummarizationResponse.
+    Failures after the stream has started are sent as an "error" event.
+    """
+    logger.info(
+        "Processing streaming summarization request. Text length: %s",
+        len(request.text),
+    )
+
+    # Admission is decided before the stream starts so rejections get a status
+    admission = summarization_admission.admit(
+        estimate_summarization_cost(request.text), priority, session_key
+    )
+    try:
+        await admission.__aenter__()
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=e.detail,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+    async def event_stream():
+        try:
+            async for event, payload in summarization_service.stream_summary(
+                text=request.text, max_length=request.max_length, style=request.style
+            ):
+                if event == "token":
+                    yield _sse_event("token", {"text": payload})
+                elif event == "key_points":
+                    yield _sse_event("key_points", {"key_points": payload})
+                else:
+                    yield _sse_event(
+                        "summary", SummarizationResponse(**payload).model_dump()
+                    )
+        except Exception as e:
+            logger.error("Streaming summarization failed: %s", e)
+            yield _sse_event("error", {"detail": str(e)})
+        finally:
+            await admission.__aexit__(None, None, None)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,61 +1,264 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi import (
+    APIRouter,
+    UploadFile,
+    File,
+    Form,
+    Header,
+    HTTPException,
+    Depends,
+    Query,
+    Request,
+)
 from sqlalchemy.orm import Session
 from typing import Optional
+from ..core.config import settings
 from ..db.database import get_db
-from ..services.transcription import transcription_service
+from ..db.models import Upload
+from ..services.transcription_routing import transcription_router
+from ..services.admission import (
+    AdmissionRejected,
+    estimate_transcription_cost,
+    get_request_priority,
+    get_session_key,
+    transcription_admission,
+)
 from ..storage.file_storage import file_storage
-from ..schemas.transcription import TranscriptionRequest, TranscriptionResponse
-from ..core.logging import get_logger
+from ..storage.chunked_uploads import chunked_uploads
+from ..schemas.transcription import (
+    TranscriptionRequest,
+    TranscriptionResponse,
+    UploadCreateRequest,
+    UploadFinalizeRequest,
+    UploadStatusResponse,
+)
+from ..core.logging import get_logger, timed_stage
+from ..utils.audio import probe_duration
 
 logger = get_logger("transcribe_router")
 router = APIRouter()
 
 
+ALLOWED_AUDIO_TYPES = [".wav", ".mp3", ".m4a", ".webm", ".ogg"]
+
+
+def _validate_audio_filename(filename: Optional[str]):
+    """Raise a 400 unless filename has an allowed audio extension"""
+    if not filename:
+        raise HTTPException(status_code=400, detail="No audio file provided")
+
+    file_extension = filename.lower().split(".")[-1] if "." in filename else ""
+    if f".{file_extension}" not in ALLOWED_AUDIO_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type. Allowed: {', '.join(ALLOWED_AUDIO_TYPES)}",
+        )
+
+
+async def _transcribe_stored(
+    file_path: str,
+    num_bytes: int,
+    language: Optional[str],
+    priority: str,
+    session_key: Optional[str],
+) -> TranscriptionResponse:
+    """Transcribe stored audio locally or on the overflow provider"""
+    # Estimate cost from the audio duration; only local work is charged for it
+    with timed_stage("probe_audio"):
+        duration = await probe_duration(file_path)
+    cost = estimate_transcription_cost(num_bytes, duration)
+
+    # Transcribe audio
+    with timed_stage("transcribe"):
+        result = await transcription_router.transcribe_audio(
+            file_path,
+            language,
+            local_admission=lambda: transcription_admission.admit(
+                cost, priority, session_key
+            ),
+            estimated_seconds=cost,
+        )
+
+    logger.info(
+        "Transcription completed successfully. Text length: %s",
+        len(result["text"]),
+    )
+
+    return TranscriptionResponse(
+        text=result["text"],
+        confidence=result["confidence"],
+        language=result["language"],
+        duration=result["duration"],
+        backend=result["backend"],
+    )
+
+
+def _admission_error(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=e.status_code,
+        detail=e.detail,
+        headers={"Retry-After": str(e.retry_after)},
+    )
+
+
 @router.post("/transcribe", response_model=TranscriptionResponse)
 async def transcribe_audio(
     audio: UploadFile = File(...),
     language: Optional[str] = Form(None),
     model: Optional[str] = Form("base"),
     db: Session = Depends(get_db),
+    priority: str = Depends(get_request_priority),
+    session_key: Optional[str] = Depends(get_session_key),
 ):
     """
     Transcribe uploaded audio file using Whisper
     """
     try:
         # Validate file
-        if not audio.filename:
-            raise HTTPException(status_code=400, detail="No audio file provided")
+        _validate_audio_filename(audio.filename)
 
-        # Check file type
-        allowed_types = [".wav", ".mp3", ".m4a", ".webm", ".ogg"]
-        file_extension = (
-            audio.filename.lower().split(".")[-1] if "." in audio.filename else ""
-        )
-        if f".{file_extension}" not in allowed_types:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Unsupported file type. Allowed: {', '.join(allowed_types)}",
-            )
+        logger.info("Processing transcription request for file: %s", audio.filename)
 
-        logger.info(f"Processing transcription request for file: {audio.filename}")
+        audio.file.seek(0, 2)
+        num_bytes = audio.file.tell()
+        audio.file.seek(0)
 
         # Save uploaded file
-        file_path = await file_storage.save_audio_file(audio)
+        with timed_stage("save_upload"):
+            file_path = await file_storage.save_audio_file(audio)
+
+        try:
+            return await _transcribe_stored(
+                file_path, num_bytes, language, priority, session_key
+            )
+        except AdmissionRejected:
+            # The client re-sends the audio when it retries
+            file_storage.delete_file(file_path)
+            raise
+
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+    except Exception as e:
+        logger.error("Transcription failed: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _upload_status(db: Session, upload: Upload) -> UploadStatusResponse:
+    ranges = chunked_uploads.received_ranges(db, upload)
+    return UploadStatusResponse(
+        upload_id=upload.id,
+        filename=upload.filename,
+        size=upload.size,
+        chunk_size=settings.upload_chunk_size,
+        status=upload.status,
+        received_ranges=ranges,
+        bytes_received=sum(end - start for start, end in ranges),
+    )
+
+
+def _get_upload(db: Session, upload_id: str) -> Upload:
+    upload = db.query(Upload).filter(Upload.id == upload_id).first()
+    if not upload:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    return upload
+
 
-        # Transcribe audio
-        result = await transcription_service.transcribe_audio(file_path, language)
+@router.post("/transcribe/uploads", response_model=UploadStatusResponse)
+async def create_upload(request: UploadCreateRequest, db: Session = Depends(get_db)):
+    """
+    Start a resumable upload
 
-        logger.info(
-            f"Transcription completed successfully. Text length: {len(result['text'])}"
+    Send the file as chunks with PUT /transcribe/uploads/{upload_id}/chunks,
+    in any order and in parallel, then call finalize.
+    """
+    try:
+        _validate_audio_filename(request.filename)
+        upload = chunked_uploads.create_upload(
+            db, request.filename, request.size, request.sha256
         )
+        return _upload_status(db, upload)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to create upload: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.put(
+    "/transcribe/uploads/{upload_id}/chunks", response_model=UploadStatusResponse
+)
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0, description="Byte offset of this chunk"),
+    x_chunk_sha256: str = Header(..., description="Hex SHA-256 of the chunk body"),
+    db: Session = Depends(get_db),
+):
+    """Write one chunk (raw request body) at offset"""
+    try:
+        upload = _get_upload(db, upload_id)
+        await chunked_uploads.write_chunk(
+            db, upload, offset, x_chunk_sha256, request.stream()
+        )
+        return _upload_status(db, upload)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to write chunk for upload %s: %s", upload_id, e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/transcribe/uploads/{upload_id}", response_model=UploadStatusResponse)
+async def get_upload(upload_id: str, db: Session = Depends(get_db)):
+    """Get which byte ranges of an upload have been received"""
+    return _upload_status(db, _get_upload(db, upload_id))
 
-        return TranscriptionResponse(
-            text=result["text"],
-            confidence=result["confidence"],
-            language=result["language"],
-            duration=result["duration"],
+
+@router.post(
+    "/transcribe/uploads/{upload_id}/finalize", response_model=TranscriptionResponse
+)
+async def finalize_upload(
+    upload_id: str,
+    request: UploadFinalizeRequest,
+    db: Session = Depends(get_db),
+    priority: str = Depends(get_request_priority),
+    session_key: Optional[str] = Depends(get_session_key),
+):
+    """Assemble a completed upload in place and transcribe it"""
+    try:
+        upload = _get_upload(db, upload_id)
+
+        logger.info("Processing transcription request for upload: %s", upload_id)
+
+        # Finalizing again after a rejection returns the same file
+        with timed_stage("save_upload"):
+            file_path = await chunked_uploads.finalize(db, upload)
+
+        return await _transcribe_stored(
+            file_path, upload.size, request.language, priority, session_key
         )
 
+    except HTTPException:
+        raise
+    except AdmissionRejected as e:
+        raise _admission_error(e)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Transcription failed: {e}")
+        logger.error("Transcription of upload %s failed: %s", upload_id, e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/transcribe/backends")
+async def get_transcription_backends():
+    """Latency and error-rate stats of the local and overflow backends"""
+    return transcription_router.get_stats()
@@ -38,3 +38,11 @@ class NoteListResponse(BaseModel):
     total: int
     page: int
     size: int
+
+
+class NoteChangesResponse(BaseModel):
+    notes: list[NoteResponse]
+    deleted_ids: list[int] = []
+    next_since: datetime
+    next_after_id: Optional[int] = None
+    has_more: bool
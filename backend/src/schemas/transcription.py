@@ -12,6 +12,31 @@ class TranscriptionResponse(BaseModel):
     confidence: float
     language: Optional[str] = None
     duration: Optional[float] = None
+    backend: Optional[str] = Field(None, description="Backend that produced the result")
+
+
+class UploadCreateRequest(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    size: int = Field(..., gt=0, description="Total file size in bytes")
+    sha256: Optional[str] = Field(
+        None, min_length=64, max_length=64, description="Optional whole-file SHA-256"
+    )
+
+
+class UploadStatusResponse(BaseModel):
+    upload_id: str
+    filename: str
+    size: int
+    chunk_size: int = Field(..., description="Recommended chunk size in bytes")
+    status: str
+    received_ranges: list[list[int]] = Field(
+        ..., description="Received [start, end) byte ranges"
+    )
+    bytes_received: int
+
+
+class UploadFinalizeRequest(BaseModel):
+    language: Optional[str] = Field(None, description="Language code for transcription")
 
 
 class SummarizationRequest(BaseModel):
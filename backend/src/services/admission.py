@@ -0,0 +1,235 @@
+import asyncio
+import math
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Optional
+from fastapi import Depends, Header
+from sqlalchemy.orm import Session as DBSession
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..db.database import get_db
+from ..db.models import Session
+
+logger = get_logger("admission")
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = (INTERACTIVE, BATCH)
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Cost-based admission control for an inference endpoint
+
+    Each request carries an estimated cost in seconds of work. Requests are
+    admitted while the in-flight cost stays under capacity, otherwise they
+    wait in a bounded queue and are rejected fast when the queue is full or
+    the wait times out. Batch requests may only use a share of capacity and
+    never overtake queued interactive requests. Each session may have at most
+    session_limit requests queued or in flight.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: float,
+        max_queue_cost: float,
+        max_queue_wait: float,
+        session_limit: int,
+        batch_share: float,
+    ):
+        self.name = name
+        self.capacity = capacity
+        self.max_queue_cost = max_queue_cost
+        self.max_queue_wait = max_queue_wait
+        self.session_limit = session_limit
+        self.batch_share = batch_share
+
+        self.in_flight_cost = 0.0
+        self.in_flight_count = 0
+        self.queued_cost = 0.0
+        self.queued_interactive = 0
+        self.session_requests = defaultdict(int)
+        self._condition = asyncio.Condition()
+
+    def _limit(self, priority: str) -> float:
+        return self.capacity if priority == INTERACTIVE else self.capacity * self.batch_share
+
+    def _can_admit(self, cost: float, priority: str) -> bool:
+        if priority == BATCH and self.queued_interactive:
+            return False
+        # An idle endpoint always accepts one request, even above capacity
+        if self.in_flight_count == 0:
+            return True
+        return self.in_flight_cost + cost <= self._limit(priority)
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up (mean in-flight cost)"""
+        if not self.in_flight_count:
+            return 1
+        return max(1, math.ceil(self.in_flight_cost / self.in_flight_count))
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "in_flight_cost": self.in_flight_cost,
+            "in_flight_count": self.in_flight_count,
+            "queued_cost": self.queued_cost,
+        }
+
+    @asynccontextmanager
+    async def admit(
+        self, cost: float, priority: str = INTERACTIVE, session_key: Optional[str] = None
+    ):
+        """
+        Hold capacity for the duration of the block
+
+        Raises:
+            AdmissionRejected: 429 when the session is over its limit, 503 when
+                the queue is full or the request waited too long
+        """
+        if not settings.admission_enabled:
+            yield
+            return
+
+        async with self._condition:
+            if session_key:
+                if self.session_requests.get(session_key, 0) >= self.session_limit:
+                    raise AdmissionRejected(
+                        429,
+                        "Too many concurrent requests for this session",
+                        self.retry_after(),
+                    )
+                self.session_requests[session_key] += 1
+
+            try:
+                if not self._can_admit(cost, priority):
+                    await self._wait_in_queue(cost, priority)
+            except BaseException:
+                # Rejected, or cancelled while queued (client went away)
+                self._release_session(session_key)
+                raise
+
+            self.in_flight_cost += cost
+            self.in_flight_count += 1
+
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight_cost -= cost
+                self.in_flight_count -= 1
+                self._release_session(session_key)
+                self._condition.notify_all()
+
+    def _release_session(self, session_key: Optional[str]):
+        if session_key:
+            self.session_requests[session_key] -= 1
+            if not self.session_requests[session_key]:
+                del self.session_requests[session_key]
+
+    async def _wait_in_queue(self, cost: float, priority: str):
+        """Wait (holding the condition lock) until the request can be admitted"""
+        if self.queued_cost + cost > self.max_queue_cost:
+            logger.warning(
+                "%s: queue full, rejecting request (cost %.1f)", self.name, cost
+            )
+            raise AdmissionRejected(503, "Server busy, try again later", self.retry_after())
+
+        self.queued_cost += cost
+        if priority == INTERACTIVE:
+            self.queued_interactive += 1
+        try:
+            await asyncio.wait_for(
+                self._condition.wait_for(lambda: self._can_admit(cost, priority)),
+                timeout=self.max_queue_wait,
+            )
+        except asyncio.TimeoutError:
+            logger.warning("%s: queue wait timed out (cost %.1f)", self.name, cost)
+            raise AdmissionRejected(503, "Server busy, try again later", self.retry_after())
+        finally:
+            self.queued_cost -= cost
+            if priority == INTERACTIVE:
+                self.queued_interactive -= 1
+            # Batch requests may have been blocked by this interactive waiter
+            self._condition.notify_all()
+
+
+def estimate_transcription_cost(
+    num_bytes: int, duration: Optional[float] = None
+) -> float:
+    """
+    Estimated seconds of work: audio duration x model real-time factor
+
+    The duration is guessed from the file size when it could not be probed.
+    """
+    if duration is None:
+        duration = num_bytes / settings.admission_audio_bytes_per_second
+    duration = min(duration, settings.max_audio_duration)
+    return duration * settings.whisper_realtime_factor
+
+
+def estimate_summarization_cost(text: str) -> float:
+    """Estimated seconds of work: token count x LLM latency per token"""
+    tokens = len(text) / 4  # ~4 characters per token for English text
+    return tokens / 1000 * settings.llm_seconds_per_1k_tokens
+
+
+def get_request_priority(
+    x_request_priority: Optional[str] = Header(None),
+) -> str:
+    """Priority class from the X-Request-Priority header (default interactive)"""
+    if x_request_priority and x_request_priority.lower() in PRIORITIES:
+        return x_request_priority.lower()
+    return INTERACTIVE
+
+
+def get_session_key(
+    x_session_id: Optional[str] = Header(None),
+    db: DBSession = Depends(get_db),
+) -> Optional[str]:
+    """
+    Fairness key for the request
+
+    Uses the active Session matching the X-Session-ID header. Anonymous
+    requests get no key and are only bound by endpoint capacity: behind a
+    proxy the client address is the proxy's, shared by every user.
+    """
+    if x_session_id:
+        session = (
+            db.query(Session)
+            .filter(Session.session_id == x_session_id, Session.is_active.is_(True))
+            .first()
+        )
+        if session:
+            return f"session:{session.session_id}"
+    return None
+
+
+# Global instances
+transcription_admission = AdmissionController(
+    name="transcribe",
+    capacity=settings.transcribe_capacity_seconds,
+    max_queue_cost=settings.transcribe_capacity_seconds * settings.admission_queue_factor,
+    max_queue_wait=settings.admission_max_queue_wait,
+    session_limit=settings.admission_session_limit,
+    batch_share=settings.admission_batch_share,
+)
+summarization_admission = AdmissionController(
+    name="summarize",
+    capacity=settings.summarize_capacity_seconds,
+    max_queue_cost=settings.summarize_capacity_seconds * settings.admission_queue_factor,
+    max_queue_wait=settings.admission_max_queue_wait,
+    session_limit=settings.admission_session_limit,
+    batch_share=settings.admission_batch_share,
+)
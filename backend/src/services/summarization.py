@@ -1,22 +1,33 @@
-from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.schema import HumanMessage, SystemMessage
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from typing import List, Optional
+import asyncio
+from typing import AsyncIterator, List, Optional, Tuple
 from ..core.config import settings
 from ..core.logging import get_logger
 
 logger = get_logger("summarization")
 
+# LLM calls in flight at once when summarizing the chunks of a long text
+MAX_CONCURRENT_CHUNKS = 8
+
 
 class SummarizationService:
-    def __init__(self):
-        self.llm = None
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=4000,
-            chunk_overlap=200,
-            length_function=len,
-        )
+    def __init__(self, llm=None):
+        # Any LangChain chat model (or a stub with agenerate/astream) may be
+        # injected; otherwise ChatOpenAI is created on first use
+        self.llm = llm
+        self._text_splitter = None
+
+    @property
+    def text_splitter(self):
+        """Get or create the text splitter (imports LangChain on first use)"""
+        if self._text_splitter is None:
+            from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+            self._text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=4000,
+                chunk_overlap=200,
+                length_function=len,
+            )
+        return self._text_splitter
 
     def _get_llm(self):
         """Get or create LLM instance"""
@@ -24,6 +35,8 @@ class SummarizationService:
             if not settings.openai_api_key:
                 raise Exception("OpenAI API key not configured")
 
+            from langchain_openai import ChatOpenAI
+
             self.llm = ChatOpenAI(
                 api_key=settings.openai_api_key,
                 model="gpt-3.5-turbo",
@@ -54,27 +67,10 @@ class SummarizationService:
                     "original_length": len(text),
                 }
 
-            logger.info(f"Starting summarization. Text length: {len(text)}")
-
-            # Split text if it's too long
-            if len(text) > 8000:
-                chunks = self.text_splitter.split_text(text)
-                logger.info(f"Split text into {len(chunks)} chunks")
-                summaries = []
+            logger.info("Starting summarization. Text length: %s", len(text))
 
-                for chunk in chunks:
-                    chunk_summary = await self._summarize_chunk(
-                        chunk, max_length // len(chunks), style
-                    )
-                    summaries.append(chunk_summary)
-
-                # Combine chunk summaries
-                combined_summary = " ".join(summaries)
-                final_summary = await self._summarize_chunk(
-                    combined_summary, max_length, style
-                )
-            else:
-                final_summary = await self._summarize_chunk(text, max_length, style)
+            final_input = await self._reduce_long_text(text, max_length, style)
+            final_summary = await self._summarize_chunk(final_input, max_length, style)
 
             # Extract key points
             key_points = await self._extract_key_points(text)
@@ -89,12 +85,87 @@ class SummarizationService:
             }
 
         except Exception as e:
-            logger.error(f"Summarization failed: {e}")
+            logger.error("Summarization failed: %s", e)
             raise Exception(f"Summarization failed: {str(e)}")
 
-    async def _summarize_chunk(self, text: str, max_length: int, style: str) -> str:
-        """Summarize a single text chunk"""
-        llm = self._get_llm()
+    async def stream_summary(
+        self, text: str, max_length: int = 200, style: str = "concise"
+    ) -> AsyncIterator[Tuple[str, object]]:
+        """
+        Summarize text, yielding summary tokens as the LLM produces them
+
+        Key points are extracted concurrently with the summary stream.
+
+        Yields:
+            ("token", str) for each summary token, then ("key_points", list),
+            then ("result", dict) shaped like summarize_text's return value
+        """
+        if not text.strip():
+            yield "key_points", []
+            yield "result", {
+                "summary": "",
+                "key_points": [],
+                "word_count": 0,
+                "original_length": len(text),
+            }
+            return
+
+        logger.info("Starting streaming summarization. Text length: %s", len(text))
+
+        key_points_task = asyncio.create_task(self._extract_key_points(text))
+        try:
+            final_input = await self._reduce_long_text(text, max_length, style)
+
+            tokens = []
+            messages = self._summary_messages(final_input, max_length, style)
+            async for chunk in self._get_llm().astream(messages):
+                token = chunk.content if hasattr(chunk, "content") else str(chunk)
+                if token:
+                    tokens.append(token)
+                    yield "token", token
+
+            key_points = await key_points_task
+        finally:
+            key_points_task.cancel()
+
+        yield "key_points", key_points
+
+        final_summary = "".join(tokens).strip()
+        logger.info("Streaming summarization completed successfully")
+        yield "result", {
+            "summary": final_summary,
+            "key_points": key_points,
+            "word_count": len(final_summary.split()),
+            "original_length": len(text),
+        }
+
+    async def _reduce_long_text(self, text: str, max_length: int, style: str) -> str:
+        """Summarize chunks of long text and return the text to summarize last"""
+        if len(text) <= 8000:
+            return text
+
+        # Split text if it's too long
+        chunks = self.text_splitter.split_text(text)
+        logger.info("Split text into %s chunks", len(chunks))
+
+        # Summarize chunks concurrently; this is all time before the first
+        # streamed token
+        limit = asyncio.Semaphore(MAX_CONCURRENT_CHUNKS)
+
+        async def summarize(chunk: str) -> str:
+            async with limit:
+                return await self._summarize_chunk(
+                    chunk, max_length // len(chunks), style
+                )
+
+        summaries = await asyncio.gather(*(summarize(chunk) for chunk in chunks))
+
+        # Combine chunk summaries
+        return " ".join(summaries)
+
+    def _summary_messages(self, text: str, max_length: int, style: str) -> list:
+        """Build the summary prompt messages for a text chunk"""
+        from langchain.prompts import ChatPromptTemplate
 
         style_prompts = {
             "concise": "Provide a concise summary in 2-3 sentences.",
@@ -112,13 +183,21 @@ class SummarizationService:
             ]
         )
 
-        messages = prompt.format_messages(text=text)
+        return prompt.format_messages(text=text)
+
+    async def _summarize_chunk(self, text: str, max_length: int, style: str) -> str:
+        """Summarize a single text chunk"""
+        llm = self._get_llm()
+
+        messages = self._summary_messages(text, max_length, style)
         response = await llm.agenerate([messages])
 
         return response.generations[0][0].text.strip()
 
     async def _extract_key_points(self, text: str) -> List[str]:
         """Extract key points from text"""
+        from langchain.prompts import ChatPromptTemplate
+
         llm = self._get_llm()
 
         prompt = ChatPromptTemplate.from_messages(
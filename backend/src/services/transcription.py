@@ -1,25 +1,74 @@
-import whisper
+import asyncio
 import tempfile
+import threading
 import os
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 from ..core.config import settings
 from ..core.logging import get_logger
+from ..utils.memory import get_memory_stats
+from .transcription_backends import create_backend, resolve_backend
 
 logger = get_logger("transcription")
 
 
+def confidence_from_logprobs(logprobs: List[float]) -> float:
+    """Convert average log probability to a confidence on a 0-1 scale"""
+    if not logprobs:
+        return 0.0
+    average = sum(logprobs) / len(logprobs)
+    return min(1.0, max(0.0, (average + 1) / 2))
+
+
 class TranscriptionService:
-    def __init__(self):
-        self.model = None
+    def __init__(self, backend_name: Optional[str] = None):
+        self.backend = None
+        self.backend_name = backend_name or settings.transcription_backend
         self.model_name = settings.whisper_model
+        self._load_lock = threading.Lock()
+        # openai-whisper installs its KV cache as forward hooks on the shared
+        # model, so concurrent decodes would overwrite each other's caches
+        self._inference_lock = threading.Lock()
 
     def _load_model(self):
-        """Load Whisper model if not already loaded"""
-        if self.model is None:
-            logger.info(f"Loading Whisper model: {self.model_name}")
-            self.model = whisper.load_model(self.model_name)
-            logger.info("Whisper model loaded successfully")
+        """Load the transcription backend and its model if not already loaded"""
+        # Called from worker threads; the lock keeps concurrent first requests
+        # from loading the model twice
+        with self._load_lock:
+            if self.backend is None:
+                memory = get_memory_stats()
+                logger.info(
+                    "Loading Whisper model: %s (backend: %s), "
+                    "worker %s memory before load: rss=%sMB uss=%sMB",
+                    self.model_name,
+                    self.backend_name,
+                    memory["pid"],
+                    memory["rss_mb"],
+                    memory["uss_mb"],
+                )
+                backend = create_backend(self.backend_name, self.model_name)
+                backend.load()
+                self.backend = backend
+                logger.info("Whisper model loaded successfully")
+
+                memory = get_memory_stats()
+                logger.info(
+                    "Worker %s memory after model load: rss=%sMB uss=%sMB",
+                    memory["pid"],
+                    memory["rss_mb"],
+                    memory["uss_mb"],
+                )
+
+    def is_thread_safe(self) -> bool:
+        """Whether transcriptions can run concurrently on this service"""
+        return resolve_backend(self.backend_name).thread_safe
+
+    def _run_backend(self, audio_file_path: str, language: Optional[str]) -> dict:
+        """Run the backend, one file at a time unless it is thread-safe"""
+        if self.backend.thread_safe:
+            return self.backend.transcribe(audio_file_path, language)
+        with self._inference_lock:
+            return self.backend.transcribe(audio_file_path, language)
 
     async def transcribe_audio(
         self, audio_file_path: str, language: Optional[str] = None
@@ -35,15 +84,14 @@ class TranscriptionService:
             dict: Transcription result with text, confidence, and metadata
         """
         try:
-            self._load_model()
+            # Inference is CPU-bound; run it off the event loop
+            await asyncio.to_thread(self._load_model)
 
-            logger.info(f"Starting transcription of {audio_file_path}")
+            logger.info("Starting transcription of %s", audio_file_path)
 
-            # Transcribe with Whisper
-            result = self.model.transcribe(
-                audio_file_path,
-                language=language,
-                fp16=False,  # Use CPU for better compatibility
+            # Transcribe with the configured backend
+            result = await asyncio.to_thread(
+                self._run_backend, audio_file_path, language
             )
 
             # Extract results
@@ -51,12 +99,9 @@ class TranscriptionService:
             language_detected = result.get("language", language)
 
             # Calculate confidence (average of segment confidences if available)
-            confidence = 0.0
-            if "segments" in result and result["segments"]:
-                confidences = [seg.get("avg_logprob", 0) for seg in result["segments"]]
-                confidence = sum(confidences) / len(confidences) if confidences else 0.0
-                # Convert log probability to confidence (0-1 scale)
-                confidence = min(1.0, max(0.0, (confidence + 1) / 2))
+            confidence = confidence_from_logprobs(
+                [seg.get("avg_logprob", 0) for seg in result.get("segments") or []]
+            )
 
             # Get audio duration
             duration = None
@@ -64,7 +109,7 @@ class TranscriptionService:
                 duration = result["segments"][-1].get("end", 0)
 
             logger.info(
-                f"Transcription completed. Text length: {len(transcription_text)}"
+                "Transcription completed. Text length: %s", len(transcription_text)
             )
 
             return {
@@ -75,7 +120,7 @@ class TranscriptionService:
             }
 
         except Exception as e:
-            logger.error(f"Transcription failed: {e}")
+            logger.error("Transcription failed: %s", e)
             raise Exception(f"Transcription failed: {str(e)}")
 
 
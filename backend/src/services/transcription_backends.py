@@ -0,0 +1,268 @@
+import os
+from pathlib import Path
+from typing import Optional
+from ..core.config import settings
+from ..core.logging import get_logger
+
+logger = get_logger("transcription_backends")
+
+
+class TranscriptionBackend:
+    """
+    Base class for CPU inference engines used by TranscriptionService
+
+    Backends return a Whisper-shaped result dict: "text", "language" and
+    "segments" (each with "avg_logprob" and "end").
+    """
+
+    name = "base"
+    # Whether one loaded model can decode several files at once
+    thread_safe = False
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.model = None
+
+    def load(self):
+        """Load the model if not already loaded"""
+        raise NotImplementedError
+
+    def transcribe(self, audio_file_path: str, language: Optional[str] = None) -> dict:
+        """Transcribe an audio file"""
+        raise NotImplementedError
+
+    def _apply_thread_count(self):
+        """Apply settings.whisper_cpu_threads to torch (0 keeps the default)"""
+        if settings.whisper_cpu_threads > 0:
+            import torch
+
+            torch.set_num_threads(settings.whisper_cpu_threads)
+
+
+class PyTorchBackend(TranscriptionBackend):
+    """Reference openai-whisper implementation running in fp32 on CPU"""
+
+    name = "pytorch"
+
+    def load(self):
+        if self.model is None:
+            self._apply_thread_count()
+            self.model = self._load_model()
+
+    def _load_model(self):
+        # Imported here so that importing this module does not pull in torch
+        import whisper
+
+        if settings.whisper_shared_weights:
+            return self._load_shared_model()
+        return whisper.load_model(self.model_name, device="cpu")
+
+    def transcribe(self, audio_file_path: str, language: Optional[str] = None) -> dict:
+        self.load()
+        return self.model.transcribe(
+            audio_file_path,
+            language=language,
+            fp16=False,  # Use CPU for better compatibility
+        )
+
+    def _shared_weights_path(self) -> Path:
+        """Path of the memory-mappable checkpoint for the configured model"""
+        return Path(settings.whisper_weights_dir) / f"whisper-{self.model_name}.pt"
+
+    def _export_shared_weights(self, path: Path):
+        """
+        Write the model checkpoint in a format torch can memory-map
+
+        Uses an exclusive file lock so that only one worker exports while the
+        others wait and then map the finished file.
+        """
+        import fcntl
+        import whisper
+        import torch
+        from dataclasses import asdict
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_suffix(".lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if path.exists():
+                    return
+
+                logger.info("Exporting shared Whisper weights to %s", path)
+                model = whisper.load_model(self.model_name, device="cpu")
+                tmp_path = path.with_suffix(".tmp")
+                torch.save(
+                    {
+                        "dims": asdict(model.dims),
+                        "model_state_dict": model.state_dict(),
+                    },
+                    tmp_path,
+                )
+                os.replace(tmp_path, path)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_shared_model(self):
+        """
+        Load the model with its weights memory-mapped read-only
+
+        Tensors are backed by the checkpoint file, so every worker on the box
+        reads the same page-cache pages instead of holding a private copy. The
+        module is built on the meta device, so no randomly initialised copy of
+        the weights is ever allocated either.
+        """
+        import torch
+        from whisper import _ALIGNMENT_HEADS
+        from whisper.model import ModelDimensions, Whisper
+
+        path = self._shared_weights_path()
+        if not path.exists():
+            self._export_shared_weights(path)
+
+        checkpoint = torch.load(
+            path, map_location="cpu", mmap=True, weights_only=True
+        )
+        dims = ModelDimensions(**checkpoint["dims"])
+        with torch.device("meta"):
+            model = Whisper(dims)
+        # assign=True keeps the mmap-backed tensors instead of copying them
+        model.load_state_dict(checkpoint["model_state_dict"], assign=True)
+        model.eval()
+        for parameter in model.parameters():
+            parameter.requires_grad_(False)
+
+        # Non-persistent buffers are not in the checkpoint; rebuild them on
+        # the CPU the way Whisper's constructors do
+        mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(float("-inf"))
+        model.decoder.mask = mask.triu_(1)
+        if self.model_name in _ALIGNMENT_HEADS:
+            model.set_alignment_heads(_ALIGNMENT_HEADS[self.model_name])
+        else:
+            # Whisper's default: all heads of the second half of the layers
+            all_heads = torch.zeros(
+                dims.n_text_layer, dims.n_text_head, dtype=torch.bool
+            )
+            all_heads[dims.n_text_layer // 2 :] = True
+            model.register_buffer(
+                "alignment_heads", all_heads.to_sparse(), persistent=False
+            )
+
+        left_on_meta = [
+            name
+            for name, tensor in [*model.named_parameters(), *model.named_buffers()]
+            if tensor.is_meta
+        ]
+        if left_on_meta:
+            raise RuntimeError(
+                f"Shared Whisper checkpoint did not provide: {', '.join(left_on_meta)}"
+            )
+
+        logger.info("Whisper weights memory-mapped from %s", path)
+        return model
+
+
+class QuantizedPyTorchBackend(PyTorchBackend):
+    """
+    openai-whisper with Linear layers dynamically quantized to int8
+
+    Quantized weights are private to each worker, so this backend does not
+    benefit from whisper_shared_weights (they are already ~4x smaller).
+    """
+
+    name = "pytorch_int8"
+
+    def _load_model(self):
+        import torch
+        import whisper
+        from whisper.model import Linear as WhisperLinear
+
+        model = whisper.load_model(self.model_name, device="cpu")
+
+        # Whisper's Linear subclass only adds a dtype cast in forward, which is
+        # a no-op in fp32. Quantization matches module types exactly, so swap
+        # the subclass for torch's Linear first.
+        for module in model.modules():
+            if type(module) is WhisperLinear:
+                module.__class__ = torch.nn.Linear
+
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+
+class CTranslate2Backend(TranscriptionBackend):
+    """Whisper converted to CTranslate2 via the optional faster-whisper package"""
+
+    name = "ctranslate2"
+    # CTranslate2 queues concurrent calls onto its own worker pool
+    thread_safe = True
+
+    def load(self):
+        if self.model is None:
+            from faster_whisper import WhisperModel
+
+            self.model = WhisperModel(
+                self.model_name,
+                device="cpu",
+                compute_type=settings.whisper_compute_type,
+                cpu_threads=settings.whisper_cpu_threads,
+                download_root=settings.whisper_weights_dir,
+            )
+
+    def transcribe(self, audio_file_path: str, language: Optional[str] = None) -> dict:
+        self.load()
+        segments, info = self.model.transcribe(audio_file_path, language=language)
+
+        # faster-whisper yields segments lazily; decoding happens here
+        segments = [
+            {"text": seg.text, "avg_logprob": seg.avg_logprob, "end": seg.end}
+            for seg in segments
+        ]
+
+        return {
+            "text": "".join(seg["text"] for seg in segments),
+            "language": info.language,
+            "segments": segments,
+        }
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether faster-whisper is installed without importing it"""
+        from importlib.util import find_spec
+
+        return find_spec("faster_whisper") is not None
+
+
+BACKENDS = {
+    PyTorchBackend.name: PyTorchBackend,
+    QuantizedPyTorchBackend.name: QuantizedPyTorchBackend,
+    CTranslate2Backend.name: CTranslate2Backend,
+}
+
+
+def resolve_backend(name: str) -> type:
+    """
+    Backend class that create_backend will use for name
+
+    The CTranslate2 runtime resolves to the reference PyTorch backend when
+    faster-whisper is not installed.
+    """
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown transcription backend '{name}'. "
+            f"Expected one of: {', '.join(BACKENDS)}"
+        )
+
+    if name == CTranslate2Backend.name and not CTranslate2Backend.is_available():
+        return PyTorchBackend
+    return BACKENDS[name]
+
+
+def create_backend(name: str, model_name: str) -> TranscriptionBackend:
+    """Create a transcription backend by name, see resolve_backend"""
+    backend_class = resolve_backend(name)
+    if backend_class.name != name:
+        logger.warning(
+            "faster-whisper is not installed, falling back to the pytorch backend"
+        )
+    return backend_class(model_name)
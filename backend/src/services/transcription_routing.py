@@ -0,0 +1,207 @@
+import asyncio
+import time
+from contextlib import nullcontext
+from typing import AsyncContextManager, Callable, Optional
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..integrations.remote_stt import RemoteSpeechToText, create_remote_provider
+from .transcription import TranscriptionService, transcription_service
+
+logger = get_logger("transcription_routing")
+
+# Weight of the newest sample in the latency/error-rate moving averages
+EWMA_ALPHA = 0.2
+
+
+class BackendStats:
+    """Request count, moving-average latency and error rate of one backend"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.errors = 0
+        self.latency_ewma: Optional[float] = None
+        self.error_rate_ewma = 0.0
+        self.last_error_at: Optional[float] = None
+
+    def record(self, latency: float, ok: bool):
+        self.requests += 1
+        if ok:
+            self.latency_ewma = (
+                latency
+                if self.latency_ewma is None
+                else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency_ewma
+            )
+        else:
+            self.errors += 1
+            self.last_error_at = time.monotonic()
+        self.error_rate_ewma = (
+            EWMA_ALPHA * (0.0 if ok else 1.0) + (1 - EWMA_ALPHA) * self.error_rate_ewma
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "latency_ewma": self.latency_ewma,
+            "error_rate_ewma": self.error_rate_ewma,
+        }
+
+
+class TranscriptionRouter:
+    """
+    Routes transcription between the local model and a remote provider
+
+    Local transcription runs at most local_transcription_concurrency at a
+    time (always one for backends that are not thread-safe). When the expected
+    wait for a local slot exceeds overflow_queue_wait_threshold, work is sent
+    to the remote provider instead, unless that provider has recently been
+    failing or already has remote_transcription_concurrency requests in
+    flight. Remote failures fall back to local transcription. Local admission
+    control is only applied to work that actually runs locally.
+    """
+
+    def __init__(
+        self,
+        local: TranscriptionService,
+        remote: Optional[RemoteSpeechToText] = None,
+    ):
+        self.local = local
+        self.remote = remote
+        self.concurrency = settings.local_transcription_concurrency
+        if self.concurrency > 1 and not local.is_thread_safe():
+            # The service decodes one file at a time on this backend; more
+            # slots would only understate the expected wait
+            logger.warning(
+                "%s backend is not thread-safe, using 1 local transcription slot",
+                local.backend_name,
+            )
+            self.concurrency = 1
+        self._local_slots = asyncio.Semaphore(self.concurrency)
+        self.local_pending = 0  # waiting for or holding a local slot
+        self.remote_pending = 0
+
+        self.stats = {"local": BackendStats("local")}
+        if remote is not None:
+            self.stats[remote.name] = BackendStats(remote.name)
+
+    def expected_local_wait(self, estimated_seconds: Optional[float] = None) -> float:
+        """
+        Seconds a new request would wait for a local slot
+
+        Until a local transcription has finished, requests ahead are assumed
+        to take estimated_seconds each, so a cold-start burst can overflow.
+        """
+        latency = self.stats["local"].latency_ewma
+        if latency is None:
+            latency = estimated_seconds or 0.0
+        ahead = self.local_pending - self.concurrency + 1
+        if ahead <= 0:
+            return 0.0
+        return ahead * latency / self.concurrency
+
+    def _remote_healthy(self) -> bool:
+        stats = self.stats[self.remote.name]
+        if stats.error_rate_ewma <= settings.overflow_max_error_rate:
+            return True
+        # Let a probe request through once the cooldown has passed
+        return time.monotonic() - stats.last_error_at > settings.overflow_error_cooldown
+
+    def _should_overflow(self, estimated_seconds: Optional[float]) -> bool:
+        if self.remote is None or not self._remote_healthy():
+            return False
+        if self.remote_pending >= settings.remote_transcription_concurrency:
+            return False
+        expected_wait = self.expected_local_wait(estimated_seconds)
+        return expected_wait > settings.overflow_queue_wait_threshold
+
+    async def transcribe_audio(
+        self,
+        audio_file_path: str,
+        language: Optional[str] = None,
+        local_admission: Optional[Callable[[], AsyncContextManager]] = None,
+        estimated_seconds: Optional[float] = None,
+    ) -> dict:
+        """
+        Transcribe on the local model or the overflow provider
+
+        Args:
+            audio_file_path: Path to the audio file
+            language: Optional language code
+            local_admission: Returns a context manager that reserves local
+                capacity, e.g. AdmissionController.admit; only entered when
+                the work runs locally
+            estimated_seconds: Expected local processing time (audio duration
+                x real-time factor)
+
+        Returns:
+            dict: Transcription result, plus the "backend" that produced it
+        """
+        if self._should_overflow(estimated_seconds):
+            logger.info(
+                "Local queue wait %.1fs over threshold, routing to %s",
+                self.expected_local_wait(estimated_seconds),
+                self.remote.name,
+            )
+            self.remote_pending += 1
+            try:
+                result = await self._timed(
+                    self.remote.name,
+                    self.remote.transcribe(audio_file_path, language),
+                )
+                result["backend"] = self.remote.name
+                return result
+            except Exception as e:
+                logger.warning(
+                    "%s transcription failed, using local: %s",
+                    self.remote.name,
+                    e,
+                )
+            finally:
+                self.remote_pending -= 1
+
+        # Requests waiting for admission count towards the expected wait too
+        self.local_pending += 1
+        try:
+            async with local_admission() if local_admission else nullcontext():
+                async with self._local_slots:
+                    result = await self._timed(
+                        "local",
+                        self.local.transcribe_audio(audio_file_path, language),
+                    )
+        finally:
+            self.local_pending -= 1
+
+        result["backend"] = "local"
+        return result
+
+    async def _timed(self, backend: str, coroutine) -> dict:
+        """Await a transcription and record its latency and outcome"""
+        start = time.perf_counter()
+        try:
+            result = await coroutine
+        except Exception:
+            self.stats[backend].record(time.perf_counter() - start, ok=False)
+            raise
+        self.stats[backend].record(time.perf_counter() - start, ok=True)
+        return result
+
+    async def close(self):
+        """Close the overflow provider's HTTP client"""
+        if self.remote is not None:
+            await self.remote.close()
+
+    def get_stats(self) -> dict:
+        return {
+            "expected_local_wait": self.expected_local_wait(),
+            "local_pending": self.local_pending,
+            "remote_pending": self.remote_pending,
+            "backends": {name: stats.to_dict() for name, stats in self.stats.items()},
+        }
+
+
+# Global instance
+transcription_router = TranscriptionRouter(
+    transcription_service,
+    create_remote_provider(settings.transcription_overflow_provider),
+)
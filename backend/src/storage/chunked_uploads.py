@@ -0,0 +1,218 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import uuid
+from datetime import timedelta
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, List, Optional
+from sqlalchemy.orm import Session
+from ..core.config import settings
+from ..core.logging import get_logger
+from ..db.models import Upload, UploadChunk, utcnow
+from .file_storage import FileStorageService, file_storage
+
+logger = get_logger("chunked_uploads")
+
+
+class ChunkedUploadService:
+    """
+    Resumable uploads assembled in place
+
+    Each upload gets a preallocated file under upload_dir/.partial. Chunks can
+    arrive in any order and in parallel; each is written at its offset and
+    recorded in the database once its SHA-256 checks out. Finalizing moves the
+    file into FileStorageService with a rename, never a copy.
+    """
+
+    def __init__(self, storage: FileStorageService):
+        self.storage = storage
+        self.partial_dir = storage.upload_dir / ".partial"
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+
+    def _partial_path(self, upload_id: str) -> Path:
+        return self.partial_dir / upload_id
+
+    def create_upload(
+        self, db: Session, filename: str, size: int, sha256: Optional[str] = None
+    ) -> Upload:
+        """Start an upload session and preallocate its file"""
+        if size > settings.max_file_size:
+            raise ValueError(
+                f"File too large. Max size: {settings.max_file_size} bytes"
+            )
+
+        self.purge_expired(db)
+
+        upload = Upload(
+            id=str(uuid.uuid4()), filename=filename, size=size, sha256=sha256
+        )
+        with open(self._partial_path(upload.id), "wb") as f:
+            f.truncate(size)  # sparse on most filesystems
+
+        db.add(upload)
+        db.commit()
+        db.refresh(upload)
+
+        logger.info("Created upload %s (%s bytes)", upload.id, size)
+        return upload
+
+    async def write_chunk(
+        self,
+        db: Session,
+        upload: Upload,
+        offset: int,
+        sha256: str,
+        body: AsyncIterator[bytes],
+    ) -> UploadChunk:
+        """
+        Verify a chunk and write it into the upload file at offset
+
+        The chunk is staged (in memory up to upload_chunk_size, then on disk)
+        and only written once its checksum matches, so a corrupt re-send
+        cannot overwrite data already received. A failed chunk is simply
+        re-sent.
+        """
+        if upload.status != "pending":
+            raise ValueError(f"Upload is {upload.status}")
+        if offset < 0 or offset >= upload.size:
+            raise ValueError("Chunk offset outside of upload")
+
+        hasher = hashlib.sha256()
+        length = 0
+        staging = tempfile.SpooledTemporaryFile(max_size=settings.upload_chunk_size)
+        with staging as staged:
+            async for data in body:
+                if offset + length + len(data) > upload.size:
+                    raise ValueError("Chunk extends past end of upload")
+                staged.write(data)
+                hasher.update(data)
+                length += len(data)
+
+            if not length:
+                raise ValueError("Empty chunk")
+            if hasher.hexdigest() != sha256.lower():
+                raise ValueError("Chunk checksum mismatch")
+
+            await asyncio.to_thread(
+                _write_at, self._partial_path(upload.id), staged, offset
+            )
+
+        # A re-sent chunk replaces the earlier record for the same offset
+        db.query(UploadChunk).filter(
+            UploadChunk.upload_id == upload.id, UploadChunk.offset == offset
+        ).delete()
+        chunk = UploadChunk(
+            upload_id=upload.id, offset=offset, length=length, sha256=sha256.lower()
+        )
+        db.add(chunk)
+        db.commit()
+        return chunk
+
+    def received_ranges(self, db: Session, upload: Upload) -> List[List[int]]:
+        """Merged [start, end) byte ranges received so far"""
+        chunks = (
+            db.query(UploadChunk.offset, UploadChunk.length)
+            .filter(UploadChunk.upload_id == upload.id)
+            .order_by(UploadChunk.offset)
+            .all()
+        )
+
+        ranges = []
+        for offset, length in chunks:
+            if ranges and offset <= ranges[-1][1]:
+                ranges[-1][1] = max(ranges[-1][1], offset + length)
+            else:
+                ranges.append([offset, offset + length])
+        return ranges
+
+    async def finalize(self, db: Session, upload: Upload) -> str:
+        """
+        Verify the upload is complete and hand the file to FileStorageService
+
+        Finalizing a completed upload again returns the stored file, so a
+        client can retry if processing after finalize failed.
+
+        Returns:
+            str: Path to stored file
+        """
+        if upload.status == "complete":
+            return upload.file_path
+
+        # Claim the upload so concurrent finalize calls cannot both proceed
+        claimed = (
+            db.query(Upload)
+            .filter(Upload.id == upload.id, Upload.status == "pending")
+            .update({Upload.status: "finalizing"})
+        )
+        db.commit()
+        if not claimed:
+            db.refresh(upload)
+            raise ValueError(f"Upload is {upload.status}")
+
+        try:
+            if self.received_ranges(db, upload) != [[0, upload.size]]:
+                raise ValueError("Upload is incomplete")
+
+            partial_path = self._partial_path(upload.id)
+            if upload.sha256:
+                digest = await asyncio.to_thread(_file_sha256, partial_path)
+                if digest != upload.sha256.lower():
+                    raise ValueError("File checksum mismatch")
+
+            file_path = self.storage.adopt_file(
+                partial_path, Path(upload.filename).suffix
+            )
+        except Exception:
+            upload.status = "pending"
+            db.commit()
+            raise
+
+        db.query(UploadChunk).filter(UploadChunk.upload_id == upload.id).delete()
+        upload.status = "complete"
+        upload.file_path = file_path
+        db.commit()
+
+        logger.info("Finalized upload %s", upload.id)
+        return file_path
+
+    def purge_expired(self, db: Session):
+        """Delete unfinished uploads older than upload_session_ttl"""
+        cutoff = utcnow() - timedelta(seconds=settings.upload_session_ttl)
+        expired = (
+            db.query(Upload)
+            .filter(Upload.status != "complete", Upload.created_at < cutoff)
+            .all()
+        )
+        for upload in expired:
+            self._partial_path(upload.id).unlink(missing_ok=True)
+            db.query(UploadChunk).filter(UploadChunk.upload_id == upload.id).delete()
+            db.delete(upload)
+        if expired:
+            db.commit()
+            logger.info("Purged %s expired uploads", len(expired))
+
+
+def _write_at(path: Path, source: BinaryIO, offset: int):
+    """Copy source from its start into path at offset"""
+    source.seek(0)
+    position = offset
+    fd = os.open(path, os.O_WRONLY)
+    try:
+        for block in iter(lambda: source.read(1024 * 1024), b""):
+            os.pwrite(fd, block, position)
+            position += len(block)
+    finally:
+        os.close(fd)
+
+
+def _file_sha256(path: Path) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+# Global instance
+chunked_uploads = ChunkedUploadService(file_storage)
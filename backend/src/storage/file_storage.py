@@ -49,13 +49,30 @@ class FileStorageService:
             with open(file_path, "wb") as buffer:
                 shutil.copyfileobj(file.file, buffer)
 
-            logger.info(f"Audio file saved: {file_path}")
+            logger.info("Audio file saved: %s", file_path)
             return str(file_path)
 
         except Exception as e:
-            logger.error(f"Failed to save audio file: {e}")
+            logger.error("Failed to save audio file: %s", e)
             raise
 
+    def adopt_file(self, source_path: Path, file_extension: str) -> str:
+        """
+        Move an already-written file into storage under a unique name
+
+        The source must be on the same filesystem (e.g. under upload_dir), so
+        this is a rename rather than a copy.
+
+        Returns:
+            str: Path to stored file
+        """
+        unique_filename = f"{uuid.uuid4()}{file_extension}"
+        file_path = self.upload_dir / unique_filename
+        os.replace(source_path, file_path)
+
+        logger.info("Audio file stored: %s", file_path)
+        return str(file_path)
+
     def get_file_path(self, filename: str) -> Optional[Path]:
         """Get full path to a file by filename"""
         file_path = self.upload_dir / filename
@@ -67,11 +84,11 @@ class FileStorageService:
             path = Path(file_path)
             if path.exists():
                 path.unlink()
-                logger.info(f"File deleted: {file_path}")
+                logger.info("File deleted: %s", file_path)
                 return True
             return False
         except Exception as e:
-            logger.error(f"Failed to delete file {file_path}: {e}")
+            logger.error("Failed to delete file %s: %s", file_path, e)
             return False
 
     def get_file_info(self, file_path: str) -> Optional[dict]:
@@ -87,7 +104,7 @@ class FileStorageService:
                 }
             return None
         except Exception as e:
-            logger.error(f"Failed to get file info for {file_path}: {e}")
+            logger.error("Failed to get file info for %s: %s", file_path, e)
             return None
 
 
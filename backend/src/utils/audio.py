@@ -0,0 +1,108 @@
+import asyncio
+import shutil
+import wave
+from typing import Optional
+from ..core.logging import get_logger
+
+logger = get_logger("audio")
+
+PROBE_TIMEOUT = 10.0  # seconds
+
+
+async def _ffprobe(*args: str) -> Optional[str]:
+    """Run ffprobe and return its stdout, or None on failure"""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "ffprobe",
+            "-v",
+            "error",
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError as e:
+        logger.warning("Could not run ffprobe: %s", e)
+        return None
+
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        logger.warning("ffprobe timed out")
+        return None
+
+    if process.returncode != 0:
+        return None
+    return stdout.decode(errors="replace")
+
+
+def _parse_seconds(value: str) -> Optional[float]:
+    try:
+        seconds = float(value)
+    except ValueError:  # ffprobe prints N/A for unknown values
+        return None
+    return seconds if seconds >= 0 else None
+
+
+async def _ffprobe_duration(file_path: str) -> Optional[float]:
+    output = await _ffprobe(
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        file_path,
+    )
+    if output is None:
+        return None
+
+    duration = _parse_seconds(output.strip())
+    if duration is not None:
+        return duration
+
+    # Browser MediaRecorder webm has no duration in its header; use the end
+    # of the last audio packet instead (demux only, no decoding)
+    output = await _ffprobe(
+        "-select_streams",
+        "a:0",
+        "-show_entries",
+        "packet=pts_time,duration_time",
+        "-of",
+        "csv=p=0",
+        file_path,
+    )
+    if output is None:
+        return None
+
+    end = None
+    for line in output.splitlines():
+        fields = [_parse_seconds(field) for field in line.split(",")]
+        if fields and fields[0] is not None:
+            packet_end = fields[0] + (fields[1] if len(fields) > 1 and fields[1] else 0)
+            end = packet_end if end is None else max(end, packet_end)
+    return end
+
+
+def _wav_duration(file_path: str) -> Optional[float]:
+    try:
+        with wave.open(file_path, "rb") as audio:
+            return audio.getnframes() / audio.getframerate()
+    except (wave.Error, EOFError, OSError, ZeroDivisionError):
+        return None
+
+
+async def probe_duration(file_path: str) -> Optional[float]:
+    """
+    Duration of an audio file in seconds, or None when it cannot be read
+
+    Uses ffprobe, which ships with the ffmpeg that Whisper decodes audio
+    with, and falls back to the header of WAV files.
+    """
+    if shutil.which("ffprobe"):
+        duration = await _ffprobe_duration(file_path)
+        if duration is not None:
+            return duration
+
+    if file_path.lower().endswith(".wav"):
+        return await asyncio.to_thread(_wav_duration, file_path)
+    return None
@@ -0,0 +1,171 @@
+"""
+Compress (or decompress) note text stored by older versions.
+
+CompressedText reads plain and compressed values alike, so existing rows stay
+readable without this tool; it rewrites them to reclaim space and reports the
+compression ratio and the per-MB cost of compressing and decompressing. Run
+from the backend directory:
+
+    python -m src.utils.compress_notes --dry-run
+    python -m src.utils.compress_notes
+    python -m src.utils.compress_notes --decompress
+
+Rewriting does not touch updated_at, so note ETags and /notes/changes are
+unaffected. Run VACUUM afterwards to shrink the SQLite file itself.
+"""
+
+import argparse
+import sys
+import time
+from sqlalchemy import Text, bindparam, select, type_coerce, update
+
+COLUMNS = ("content", "transcript", "summary")
+
+
+def _stored_size(value) -> int:
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(value)
+
+
+def _per_mb(seconds: float, num_bytes: int) -> float:
+    """Milliseconds per MB of uncompressed text"""
+    if not num_bytes:
+        return 0.0
+    return seconds * 1000 / (num_bytes / (1024 * 1024))
+
+
+def migrate(decompress: bool = False, dry_run: bool = False, batch_size: int = 500):
+    from ..db.database import engine
+    from ..db.models import Note
+    from ..db.types import compress_text, decompress_text
+
+    notes = Note.__table__
+    # Read the stored values as-is, bypassing CompressedText
+    raw_columns = [type_coerce(notes.c[name], Text).label(name) for name in COLUMNS]
+
+    stats = {"rows": 0, "rewritten": 0, "raw": 0, "before": 0, "after": 0}
+    compress_seconds = decompress_seconds = 0.0
+    last_id = 0
+
+    while True:
+        with engine.begin() as connection:
+            rows = connection.execute(
+                select(notes.c.id, *raw_columns)
+                .where(notes.c.id > last_id)
+                .order_by(notes.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            changes = []
+            for row in rows:
+                stats["rows"] += 1
+                new_values = {}
+                for name in COLUMNS:
+                    stored = getattr(row, name)
+                    if stored is None:
+                        continue
+
+                    start = time.perf_counter()
+                    text = decompress_text(stored)
+                    decompress_seconds += time.perf_counter() - start
+
+                    if decompress:
+                        new_value = text
+                    else:
+                        start = time.perf_counter()
+                        new_value = compress_text(text)
+                        compress_seconds += time.perf_counter() - start
+                        # Time reading the new value back, as the app will
+                        start = time.perf_counter()
+                        decompress_text(new_value)
+                        decompress_seconds += time.perf_counter() - start
+
+                    stats["raw"] += len(text.encode("utf-8"))
+                    stats["before"] += _stored_size(stored)
+                    stats["after"] += _stored_size(new_value)
+                    if type(new_value) is not type(stored) or new_value != stored:
+                        new_values[name] = new_value
+
+                if new_values:
+                    stats["rewritten"] += 1
+                    changes.append((row.id, new_values))
+
+            if not dry_run:
+                for note_id, new_values in changes:
+                    # Core UPDATE applies onupdate defaults; keep updated_at
+                    connection.execute(
+                        update(notes)
+                        .where(notes.c.id == bindparam("note_id"))
+                        .values(
+                            updated_at=notes.c.updated_at,
+                            **{
+                                name: bindparam(f"new_{name}", type_=Text)
+                                for name in new_values
+                            },
+                        ),
+                        {
+                            "note_id": note_id,
+                            **{f"new_{name}": v for name, v in new_values.items()},
+                        },
+                    )
+
+    return {
+        **stats,
+        "ratio": stats["raw"] / stats["after"] if stats["after"] else 1.0,
+        "compress_ms_per_mb": _per_mb(compress_seconds, stats["raw"]),
+        "decompress_ms_per_mb": _per_mb(decompress_seconds, stats["raw"]),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--decompress",
+        action="store_true",
+        help="Store every value as plain text again (e.g. before a downgrade)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report without writing anything"
+    )
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    from ..core.config import settings
+    from ..db.types import zstandard
+
+    algorithm = settings.compression_algorithm
+    if algorithm == "zstd" and zstandard is None:
+        algorithm = "zlib (zstandard not installed)"
+    if not args.decompress:
+        print(
+            f"Codec: {algorithm}, level {settings.compression_level}, "
+            f"threshold {settings.compression_threshold} bytes"
+        )
+
+    result = migrate(
+        decompress=args.decompress, dry_run=args.dry_run, batch_size=args.batch_size
+    )
+
+    mb = 1024 * 1024
+    verb = "would rewrite" if args.dry_run else "rewrote"
+    print(f"Notes: {result['rows']}, {verb} {result['rewritten']}")
+    print(
+        f"Text: {result['raw'] / mb:.2f} MB raw, "
+        f"{result['before'] / mb:.2f} MB stored before, "
+        f"{result['after'] / mb:.2f} MB after (ratio {result['ratio']:.2f}x)"
+    )
+    print(
+        f"Overhead: compress {result['compress_ms_per_mb']:.1f} ms/MB, "
+        f"decompress {result['decompress_ms_per_mb']:.1f} ms/MB"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+from typing import Optional
+
+# Languages supported by Whisper: (ISO 639-1 code as returned by local
+# Whisper, English name as returned by OpenAI verbose_json, ISO 639-3 code)
+_LANGUAGES = [
+    ("en", "english", "eng"),
+    ("zh", "chinese", "zho"),
+    ("de", "german", "deu"),
+    ("es", "spanish", "spa"),
+    ("ru", "russian", "rus"),
+    ("ko", "korean", "kor"),
+    ("fr", "french", "fra"),
+    ("ja", "japanese", "jpn"),
+    ("pt", "portuguese", "por"),
+    ("tr", "turkish", "tur"),
+    ("pl", "polish", "pol"),
+    ("ca", "catalan", "cat"),
+    ("nl", "dutch", "nld"),
+    ("ar", "arabic", "ara"),
+    ("sv", "swedish", "swe"),
+    ("it", "italian", "ita"),
+    ("id", "indonesian", "ind"),
+    ("hi", "hindi", "hin"),
+    ("fi", "finnish", "fin"),
+    ("vi", "vietnamese", "vie"),
+    ("he", "hebrew", "heb"),
+    ("uk", "ukrainian", "ukr"),
+    ("el", "greek", "ell"),
+    ("ms", "malay", "msa"),
+    ("cs", "czech", "ces"),
+    ("ro", "romanian", "ron"),
+    ("da", "danish", "dan"),
+    ("hu", "hungarian", "hun"),
+    ("ta", "tamil", "tam"),
+    ("no", "norwegian", "nor"),
+    ("th", "thai", "tha"),
+    ("ur", "urdu", "urd"),
+    ("hr", "croatian", "hrv"),
+    ("bg", "bulgarian", "bul"),
+    ("lt", "lithuanian", "lit"),
+    ("la", "latin", "lat"),
+    ("mi", "maori", "mri"),
+    ("ml", "malayalam", "mal"),
+    ("cy", "welsh", "cym"),
+    ("sk", "slovak", "slk"),
+    ("te", "telugu", "tel"),
+    ("fa", "persian", "fas"),
+    ("lv", "latvian", "lav"),
+    ("bn", "bengali", "ben"),
+    ("sr", "serbian", "srp"),
+    ("az", "azerbaijani", "aze"),
+    ("sl", "slovenian", "slv"),
+    ("kn", "kannada", "kan"),
+    ("et", "estonian", "est"),
+    ("mk", "macedonian", "mkd"),
+    ("br", "breton", "bre"),
+    ("eu", "basque", "eus"),
+    ("is", "icelandic", "isl"),
+    ("hy", "armenian", "hye"),
+    ("ne", "nepali", "nep"),
+    ("mn", "mongolian", "mon"),
+    ("bs", "bosnian", "bos"),
+    ("kk", "kazakh", "kaz"),
+    ("sq", "albanian", "sqi"),
+    ("sw", "swahili", "swa"),
+    ("gl", "galician", "glg"),
+    ("mr", "marathi", "mar"),
+    ("pa", "punjabi", "pan"),
+    ("si", "sinhala", "sin"),
+    ("km", "khmer", "khm"),
+    ("sn", "shona", "sna"),
+    ("yo", "yoruba", "yor"),
+    ("so", "somali", "som"),
+    ("af", "afrikaans", "afr"),
+    ("oc", "occitan", "oci"),
+    ("ka", "georgian", "kat"),
+    ("be", "belarusian", "bel"),
+    ("tg", "tajik", "tgk"),
+    ("sd", "sindhi", "snd"),
+    ("gu", "gujarati", "guj"),
+    ("am", "amharic", "amh"),
+    ("yi", "yiddish", "yid"),
+    ("lo", "lao", "lao"),
+    ("uz", "uzbek", "uzb"),
+    ("fo", "faroese", "fao"),
+    ("ht", "haitian creole", "hat"),
+    ("ps", "pashto", "pus"),
+    ("tk", "turkmen", "tuk"),
+    ("nn", "nynorsk", "nno"),
+    ("mt", "maltese", "mlt"),
+    ("sa", "sanskrit", "san"),
+    ("lb", "luxembourgish", "ltz"),
+    ("my", "myanmar", "mya"),
+    ("bo", "tibetan", "bod"),
+    ("tl", "tagalog", "tgl"),
+    ("mg", "malagasy", "mlg"),
+    ("as", "assamese", "asm"),
+    ("tt", "tatar", "tat"),
+    ("haw", "hawaiian", "haw"),
+    ("ln", "lingala", "lin"),
+    ("ha", "hausa", "hau"),
+    ("ba", "bashkir", "bak"),
+    ("jw", "javanese", "jav"),
+    ("su", "sundanese", "sun"),
+    ("yue", "cantonese", "yue"),
+]
+
+_TO_CODE = {}
+for _code, _name, _iso3 in _LANGUAGES:
+    _TO_CODE[_code] = _code
+    _TO_CODE[_name] = _code
+    _TO_CODE[_iso3] = _code
+# Common aliases used by providers
+_TO_CODE.update({"mandarin": "zh", "cmn": "zh", "filipino": "tl", "fil": "tl"})
+
+
+def normalize_language(language: Optional[str]) -> Optional[str]:
+    """
+    Map a language name or ISO 639 code to the code local Whisper reports
+
+    Unknown values are returned lowercased rather than dropped.
+    """
+    if not language:
+        return language
+    key = language.strip().lower().replace("_", "-")
+    return _TO_CODE.get(key, _TO_CODE.get(key.split("-")[0], key))
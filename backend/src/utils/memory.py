@@ -0,0 +1,49 @@
+import os
+import resource
+from typing import Optional
+
+
+def get_memory_stats() -> dict:
+    """
+    Get memory usage of the current process
+
+    On Linux, unique set size (USS) is the memory only this process holds;
+    it is what grows per worker. Proportional set size (PSS) splits shared
+    pages (e.g. memory-mapped model weights) across the processes mapping them.
+
+    Returns:
+        dict: pid and rss/pss/uss in MB (pss/uss are None when unavailable)
+    """
+    stats = {
+        "pid": os.getpid(),
+        "rss_mb": None,
+        "pss_mb": None,
+        "uss_mb": None,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+    rollup = _read_smaps_rollup()
+    if rollup:
+        stats["rss_mb"] = rollup.get("Rss", 0) / 1024
+        stats["pss_mb"] = rollup.get("Pss", 0) / 1024
+        stats["uss_mb"] = (
+            rollup.get("Private_Clean", 0) + rollup.get("Private_Dirty", 0)
+        ) / 1024
+
+    return stats
+
+
+def _read_smaps_rollup() -> Optional[dict]:
+    """Parse /proc/self/smaps_rollup into a dict of kB values"""
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    values = {}
+    for line in lines[1:]:  # First line is the address range header
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].endswith(":"):
+            values[parts[0][:-1]] = int(parts[1])
+    return values
@@ -0,0 +1,78 @@
+"""
+Startup benchmark: import time and peak RSS of the API per deployment role.
+
+Each role is measured in a fresh interpreter so module caches don't leak
+between runs. Run from the backend directory:
+
+    python -m src.utils.startup_benchmark --roles api all --max-import-seconds 2
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import src.main
+elapsed = time.perf_counter() - start
+heavy = [m for m in ("torch", "whisper", "langchain", "langchain_openai") if m in sys.modules]
+print(json.dumps({
+    "import_seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": heavy,
+}))
+"""
+
+
+def measure_role(role: str) -> dict:
+    """Import src.main in a subprocess with the given role and return its stats"""
+    env = dict(os.environ, SERVICE_ROLE=role)
+    completed = subprocess.run(
+        [sys.executable, "-c", _PROBE],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result["role"] = role
+    return result
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--roles", nargs="+", default=["api", "inference", "all"])
+    parser.add_argument("--max-import-seconds", type=float, default=None)
+    parser.add_argument("--max-rss-mb", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    failed = False
+    for role in args.roles:
+        stats = measure_role(role)
+        print(
+            f"{role:<10} import={stats['import_seconds']:.3f}s "
+            f"rss={stats['max_rss_mb']:.1f}MB "
+            f"heavy={','.join(stats['heavy_modules']) or '-'}"
+        )
+
+        if role == "api" and stats["heavy_modules"]:
+            print(f"  FAIL: api role imported {stats['heavy_modules']}")
+            failed = True
+        if (
+            args.max_import_seconds is not None
+            and stats["import_seconds"] > args.max_import_seconds
+        ):
+            print(f"  FAIL: import time above {args.max_import_seconds}s")
+            failed = True
+        if args.max_rss_mb is not None and stats["max_rss_mb"] > args.max_rss_mb:
+            print(f"  FAIL: RSS above {args.max_rss_mb}MB")
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Accuracy/speed parity check of a transcription backend against the reference.
+
+Transcribes each audio file with the reference "pytorch" backend and the
+candidate backend, then reports word error rate (WER) of the candidate
+against the reference output and the speedup. Run from the backend directory:
+
+    python -m src.utils.transcription_parity --backend pytorch_int8 --max-wer 0.05 data/*.wav
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from typing import List
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance normalized by reference length"""
+    ref_words = reference.lower().split()
+    hyp_words = hypothesis.lower().split()
+    if not ref_words:
+        return 0.0 if not hyp_words else 1.0
+
+    previous = list(range(len(hyp_words) + 1))
+    for i, ref_word in enumerate(ref_words, start=1):
+        current = [i] + [0] * len(hyp_words)
+        for j, hyp_word in enumerate(hyp_words, start=1):
+            current[j] = min(
+                previous[j] + 1,  # deletion
+                current[j - 1] + 1,  # insertion
+                previous[j - 1] + (ref_word != hyp_word),  # substitution
+            )
+        previous = current
+
+    return previous[-1] / len(ref_words)
+
+
+async def _timed_transcriptions(backend_name: str, audio_files: List[str]) -> list:
+    """Transcribe every file with one backend, timing each call after warm-up"""
+    from ..services.transcription import TranscriptionService
+
+    service = TranscriptionService(backend_name=backend_name)
+    service._load_model()
+
+    results = []
+    for audio_file in audio_files:
+        start = time.perf_counter()
+        result = await service.transcribe_audio(audio_file)
+        results.append((result, time.perf_counter() - start))
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("audio_files", nargs="+")
+    parser.add_argument("--backend", required=True, help="Candidate backend name")
+    parser.add_argument("--reference", default="pytorch")
+    parser.add_argument("--max-wer", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    reference = asyncio.run(_timed_transcriptions(args.reference, args.audio_files))
+    candidate = asyncio.run(_timed_transcriptions(args.backend, args.audio_files))
+
+    total_wer = 0.0
+    reference_seconds = candidate_seconds = 0.0
+    for audio_file, (ref, ref_time), (cand, cand_time) in zip(
+        args.audio_files, reference, candidate
+    ):
+        wer = word_error_rate(ref["text"], cand["text"])
+        total_wer += wer
+        reference_seconds += ref_time
+        candidate_seconds += cand_time
+        print(
+            f"{audio_file}: wer={wer:.3f} "
+            f"{args.reference}={ref_time:.2f}s {args.backend}={cand_time:.2f}s"
+        )
+
+    mean_wer = total_wer / len(args.audio_files)
+    speedup = reference_seconds / candidate_seconds if candidate_seconds else 0.0
+    print(f"mean wer={mean_wer:.3f} speedup={speedup:.2f}x")
+
+    if args.max_wer is not None and mean_wer > args.max_wer:
+        print(f"FAIL: mean WER above {args.max_wer}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
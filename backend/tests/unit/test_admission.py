@@ -0,0 +1,229 @@
+import asyncio
+import pytest
+from src.services.admission import (
+    BATCH,
+    INTERACTIVE,
+    AdmissionController,
+    AdmissionRejected,
+)
+
+
+def make_controller(**overrides) -> AdmissionController:
+    options = {
+        "name": "test",
+        "capacity": 10.0,
+        "max_queue_cost": 10.0,
+        "max_queue_wait": 1.0,
+        "session_limit": 2,
+        "batch_share": 0.5,
+    }
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+async def hold(controller, cost, release, priority=INTERACTIVE, session_key=None):
+    """Stay admitted until release is set"""
+    async with controller.admit(cost, priority, session_key):
+        await release.wait()
+
+
+async def settle():
+    """Let queued tasks run until they block"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def assert_idle(controller):
+    assert controller.in_flight_cost == 0
+    assert controller.in_flight_count == 0
+    assert controller.queued_cost == 0
+    assert controller.queued_interactive == 0
+    assert not controller.session_requests
+
+
+@pytest.mark.asyncio
+async def test_admits_within_capacity_and_releases():
+    controller = make_controller()
+
+    async with controller.admit(4.0):
+        async with controller.admit(6.0):
+            assert controller.in_flight_cost == 10.0
+            assert controller.in_flight_count == 2
+
+    assert_idle(controller)
+
+
+@pytest.mark.asyncio
+async def test_idle_endpoint_admits_request_above_capacity():
+    controller = make_controller()
+
+    async with controller.admit(50.0):
+        assert controller.in_flight_count == 1
+
+    assert_idle(controller)
+
+
+@pytest.mark.asyncio
+async def test_rejects_with_503_when_queue_is_full():
+    controller = make_controller(max_queue_cost=5.0)
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(controller, 10.0, release))
+    await settle()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with controller.admit(6.0):
+            pass
+
+    assert rejected.value.status_code == 503
+    assert rejected.value.retry_after == 10
+    assert controller.queued_cost == 0
+
+    release.set()
+    await holder
+    assert_idle(controller)
+
+
+@pytest.mark.asyncio
+async def test_rejects_with_503_when_queue_wait_times_out():
+    controller = make_controller(max_queue_wait=0.05)
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(controller, 8.0, release))
+    await settle()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with controller.admit(5.0, session_key="session:a"):
+            pass
+
+    assert rejected.value.status_code == 503
+    assert controller.queued_cost == 0
+    assert controller.queued_interactive == 0
+    # The rejected request no longer counts against its session
+    assert "session:a" not in controller.session_requests
+
+    release.set()
+    await holder
+    assert_idle(controller)
+
+
+@pytest.mark.asyncio
+async def test_queued_request_is_admitted_when_capacity_frees():
+    controller = make_controller()
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(controller, 8.0, release))
+    await settle()
+
+    waiter = asyncio.create_task(hold(controller, 5.0, asyncio.Event()))
+    await settle()
+    assert controller.queued_cost == 5.0
+
+    release.set()
+    await holder
+    await settle()
+    assert controller.in_flight_cost == 5.0
+    assert controller.queued_cost == 0
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert_idle(controller)
+
+
+@pytest.mark.asyncio
+async def test_session_limit_rejects_with_429_and_is_released():
+    controller = make_controller(session_limit=2)
+    release = asyncio.Event()
+    holders = [
+        asyncio.create_task(hold(controller, 1.0, release, session_key="session:a"))
+        for _ in range(2)
+    ]
+    await settle()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with controller.admit(1.0, session_key="session:a"):
+            pass
+    assert rejected.value.status_code == 429
+
+    # Other sessions and anonymous requests are unaffected
+    async with controller.admit(1.0, session_key="session:b"):
+        pass
+    async with controller.admit(1.0):
+        pass
+
+    release.set()
+    await asyncio.gather(*holders)
+    assert_idle(controller)
+
+    async with controller.admit(1.0, session_key="session:a"):
+        assert controller.session_requests["session:a"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queued_requests_count_against_session_limit():
+    controller = make_controller(session_limit=1)
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(controller, 10.0, release))
+    await settle()
+
+    waiter = asyncio.create_task(
+        hold(controller, 5.0, asyncio.Event(), session_key="session:a")
+    )
+    await settle()
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with controller.admit(1.0, session_key="session:a"):
+            pass
+    assert rejected.value.status_code == 429
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    release.set()
+    await holder
+    assert_idle(controller)
+
+
+@pytest.mark.asyncio
+async def test_batch_is_limited_to_its_capacity_share():
+    controller = make_controller(batch_share=0.5, max_queue_wait=0.05)
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(controller, 4.0, release, priority=BATCH))
+    await settle()
+
+    # 4 + 2 exceeds the batch share of 5, but fits an interactive request
+    with pytest.raises(AdmissionRejected):
+        async with controller.admit(2.0, BATCH):
+            pass
+    async with controller.admit(2.0, INTERACTIVE):
+        pass
+
+    release.set()
+    await holder
+    assert_idle(controller)
+
+
+@pytest.mark.asyncio
+async def test_batch_yields_to_queued_interactive():
+    controller = make_controller()
+    admitted = []
+
+    async def record(name, cost, priority):
+        async with controller.admit(cost, priority):
+            admitted.append(name)
+            await asyncio.sleep(0)
+
+    release = asyncio.Event()
+    holder = asyncio.create_task(hold(controller, 2.0, release))
+    await settle()
+
+    # The interactive request does not fit yet; the batch one would, but
+    # must not overtake it
+    interactive = asyncio.create_task(record("interactive", 9.0, INTERACTIVE))
+    await settle()
+    batch = asyncio.create_task(record("batch", 1.0, BATCH))
+    await settle()
+    assert admitted == []
+
+    release.set()
+    await asyncio.gather(holder, interactive, batch)
+    assert admitted == ["interactive", "batch"]
+    assert_idle(controller)
@@ -0,0 +1,40 @@
+import pytest
+from pydantic import ValidationError
+from src.core.config import Settings, settings
+from src.db.types import ZLIB_HEADER, ZSTD_HEADER, compress_text, decompress_text
+
+LARGE_TEXT = "the quick brown fox jumps over the lazy dog. " * 200
+
+
+@pytest.mark.parametrize(
+    "algorithm, level",
+    [("lz4", 3), ("zlib", 19), ("zlib", -5), ("zstd", 0), ("zstd", 23)],
+)
+def test_settings_reject_invalid_compression(algorithm, level):
+    with pytest.raises(ValidationError, match="compression"):
+        Settings(compression_algorithm=algorithm, compression_level=level)
+
+
+@pytest.mark.parametrize("algorithm, level", [("zlib", 9), ("zstd", 19)])
+def test_settings_accept_valid_compression(algorithm, level):
+    configured = Settings(compression_algorithm=algorithm, compression_level=level)
+    assert configured.compression_level == level
+
+
+@pytest.mark.parametrize(
+    "algorithm, level, header", [("zlib", 6, ZLIB_HEADER), ("zstd", 19, ZSTD_HEADER)]
+)
+def test_large_text_round_trips(monkeypatch, algorithm, level, header):
+    monkeypatch.setattr(settings, "compression_algorithm", algorithm)
+    monkeypatch.setattr(settings, "compression_level", level)
+
+    stored = compress_text(LARGE_TEXT)
+
+    assert stored.startswith(header)
+    assert len(stored) < len(LARGE_TEXT)
+    assert decompress_text(stored) == LARGE_TEXT
+
+
+def test_small_text_stays_plain():
+    assert compress_text("short note") == "short note"
+    assert decompress_text("short note") == "short note"
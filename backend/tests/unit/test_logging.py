@@ -0,0 +1,45 @@
+import json
+import logging
+import queue
+import pytest
+from src.core.logging import JsonFormatter, RecordQueueHandler
+
+
+@pytest.fixture
+def queued_logger():
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("echo_notes.test_queue")
+    handler = RecordQueueHandler(log_queue)
+    logger.addHandler(handler)
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    yield logger, log_queue
+    logger.removeHandler(handler)
+
+
+def test_message_shows_arguments_as_they_were_at_the_call(queued_logger):
+    logger, log_queue = queued_logger
+    values = {"a": 1}
+
+    logger.info("dict %s", values)
+    values["a"] = 2
+
+    record = log_queue.get_nowait()
+    assert record.getMessage() == "dict {'a': 1}"
+    assert record.args is None
+
+
+def test_extra_fields_and_traceback_survive_the_queue(queued_logger):
+    logger, log_queue = queued_logger
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed %s", "upload", extra={"upload_id": "u1"})
+
+    record = log_queue.get_nowait()
+    assert record.exc_info is None
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "failed upload"
+    assert entry["upload_id"] == "u1"
+    assert "ValueError: boom" in entry["exception"]
@@ -0,0 +1,94 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from src.services.summarization import MAX_CONCURRENT_CHUNKS, SummarizationService
+
+
+class StubLLM:
+    """Chat model stand-in with the agenerate/astream surface the service uses"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.summary_calls = 0
+
+    def _reply(self, messages) -> str:
+        if "Extract" in messages[0].content:
+            return "- first point\n- second point"
+        self.summary_calls += 1
+        return f"summary {self.summary_calls}"
+
+    async def agenerate(self, batch):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            text = self._reply(batch[0])
+        finally:
+            self.active -= 1
+        return SimpleNamespace(generations=[[SimpleNamespace(text=text)]])
+
+    async def astream(self, messages):
+        for token in ["The ", "final ", "summary."]:
+            yield SimpleNamespace(content=token)
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+@pytest.mark.asyncio
+async def test_stream_summary_yields_tokens_then_key_points_then_result():
+    service = SummarizationService(llm=StubLLM())
+
+    events = await collect(service.stream_summary("Some short text."))
+
+    kinds = [kind for kind, _ in events]
+    assert kinds == ["token", "token", "token", "key_points", "result"]
+    tokens = "".join(value for kind, value in events if kind == "token")
+    result = events[-1][1]
+    assert result["summary"] == tokens == "The final summary."
+    assert result["key_points"] == ["first point", "second point"]
+    assert result["word_count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_stream_summary_of_empty_text_skips_the_llm():
+    service = SummarizationService(llm=StubLLM())
+
+    events = await collect(service.stream_summary("   "))
+
+    assert events == [
+        ("key_points", []),
+        (
+            "result",
+            {"summary": "", "key_points": [], "word_count": 0, "original_length": 3},
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_long_text_chunks_are_summarized_concurrently():
+    llm = StubLLM(delay=0.05)
+    service = SummarizationService(llm=llm)
+    text = "A sentence about the meeting. " * 1000  # ~30k characters
+
+    events = await collect(service.stream_summary(text))
+
+    # Chunk summaries ran side by side, not one after another
+    assert llm.summary_calls > 2
+    assert llm.peak >= min(llm.summary_calls, MAX_CONCURRENT_CHUNKS)
+    assert events[-1][1]["summary"] == "The final summary."
+
+
+@pytest.mark.asyncio
+async def test_summarize_text_combines_chunk_summaries():
+    service = SummarizationService(llm=StubLLM())
+    text = "A sentence about the meeting. " * 1000
+
+    result = await service.summarize_text(text)
+
+    assert result["summary"].startswith("summary ")
+    assert result["key_points"] == ["first point", "second point"]
+    assert result["original_length"] == len(text)
@@ -0,0 +1,241 @@
+import asyncio
+from contextlib import asynccontextmanager
+import httpx
+import pytest
+from src.core.config import settings
+from src.integrations.remote_stt import ElevenLabsSpeechToText, OpenAISpeechToText
+from src.services.transcription_routing import TranscriptionRouter
+
+
+def mock_client(provider, handler) -> httpx.AsyncClient:
+    """Point a provider at an in-process mock server"""
+    provider._client = httpx.AsyncClient(
+        base_url=provider.base_url, transport=httpx.MockTransport(handler)
+    )
+    return provider._client
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "note.webm"
+    path.write_bytes(b"fake audio")
+    return str(path)
+
+
+@pytest.fixture
+def api_keys(monkeypatch):
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr(settings, "elevenlabs_api_key", "xi-test")
+
+
+class FakeLocal:
+    backend_name = "pytorch"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+
+    def is_thread_safe(self) -> bool:
+        return False
+
+    async def transcribe_audio(self, audio_file_path, language=None):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"text": "local", "confidence": 0.9, "language": "en", "duration": 1.0}
+
+
+def openai_handler(requests):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "text": " Hello there. ",
+                "language": "english",
+                "duration": 2.5,
+                "segments": [{"avg_logprob": -0.2}, {"avg_logprob": -0.4}],
+            },
+        )
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_openai_response_is_normalized(api_keys, audio_file):
+    provider = OpenAISpeechToText()
+    requests = []
+    mock_client(provider, openai_handler(requests))
+
+    result = await provider.transcribe(audio_file)
+
+    assert requests[0].url.path.endswith("/audio/transcriptions")
+    assert requests[0].headers["authorization"] == "Bearer sk-test"
+    assert b"verbose_json" in requests[0].content
+    assert result == {
+        "text": "Hello there.",
+        "confidence": pytest.approx(0.35),
+        "language": "en",
+        "duration": 2.5,
+    }
+    await provider.close()
+
+
+@pytest.mark.asyncio
+async def test_elevenlabs_response_is_normalized(api_keys, audio_file):
+    provider = ElevenLabsSpeechToText()
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(
+            200,
+            json={
+                "text": "Hi you",
+                "language_code": "eng",
+                "language_probability": 0.98,
+                "words": [
+                    {"text": "Hi", "type": "word", "end": 0.4, "logprob": -0.1},
+                    {"text": " ", "type": "spacing", "end": 0.5},
+                    {"text": "you", "type": "word", "end": 0.9, "logprob": -0.3},
+                ],
+            },
+        )
+
+    mock_client(provider, handler)
+
+    result = await provider.transcribe(audio_file, language="en")
+
+    assert requests[0].url.path.endswith("/speech-to-text")
+    assert requests[0].headers["xi-api-key"] == "xi-test"
+    assert result == {
+        "text": "Hi you",
+        "confidence": pytest.approx(0.4),
+        "language": "en",
+        "duration": 0.9,
+    }
+    await provider.close()
+
+
+@pytest.mark.asyncio
+async def test_close_closes_the_http_client(api_keys):
+    provider = OpenAISpeechToText()
+    client = provider._get_client()
+    router = TranscriptionRouter(FakeLocal(), provider)
+
+    await router.close()
+
+    assert client.is_closed
+    assert provider._client is None
+
+
+@pytest.mark.asyncio
+async def test_uses_local_while_the_expected_wait_is_short(api_keys, audio_file):
+    requests = []
+    remote = OpenAISpeechToText()
+    mock_client(remote, openai_handler(requests))
+    router = TranscriptionRouter(FakeLocal(), remote)
+
+    result = await router.transcribe_audio(audio_file, estimated_seconds=1.0)
+
+    assert result["backend"] == "local"
+    assert requests == []
+    await router.close()
+
+
+@pytest.mark.asyncio
+async def test_cold_start_burst_overflows_without_local_admission(
+    api_keys, audio_file, monkeypatch
+):
+    monkeypatch.setattr(settings, "overflow_queue_wait_threshold", 5.0)
+    requests = []
+    remote = OpenAISpeechToText()
+    mock_client(remote, openai_handler(requests))
+    router = TranscriptionRouter(FakeLocal(delay=0.05), remote)
+    admitted = []
+
+    @asynccontextmanager
+    async def local_admission():
+        admitted.append(True)
+        yield
+
+    # No local request has finished yet: the 60s estimate seeds the wait
+    results = await asyncio.gather(
+        *(
+            router.transcribe_audio(
+                audio_file, local_admission=local_admission, estimated_seconds=60.0
+            )
+            for _ in range(3)
+        )
+    )
+
+    assert [result["backend"] for result in results] == ["local", "openai", "openai"]
+    assert results[1]["language"] == "en"
+    # Only the local request reserved local capacity
+    assert admitted == [True]
+    assert router.stats["openai"].requests == 2
+    await router.close()
+
+
+@pytest.mark.asyncio
+async def test_remote_failure_falls_back_to_local(api_keys, audio_file, monkeypatch):
+    monkeypatch.setattr(settings, "overflow_queue_wait_threshold", 0.0)
+    remote = OpenAISpeechToText()
+    mock_client(remote, lambda request: httpx.Response(500))
+    local = FakeLocal()
+    router = TranscriptionRouter(local, remote)
+    router.local_pending = 1  # someone is already using the local slot
+
+    result = await router.transcribe_audio(audio_file, estimated_seconds=10.0)
+
+    assert result["backend"] == "local"
+    assert router.stats["openai"].errors == 1
+    assert router.remote_pending == 0
+    await router.close()
+
+
+@pytest.mark.asyncio
+async def test_failing_provider_is_skipped_until_cooldown_passes(
+    api_keys, audio_file, monkeypatch
+):
+    monkeypatch.setattr(settings, "overflow_queue_wait_threshold", 0.0)
+    monkeypatch.setattr(settings, "overflow_max_error_rate", 0.5)
+    monkeypatch.setattr(settings, "overflow_error_cooldown", 60.0)
+    requests = []
+    remote = OpenAISpeechToText()
+    mock_client(remote, openai_handler(requests))
+    router = TranscriptionRouter(FakeLocal(), remote)
+    for _ in range(5):
+        router.stats["openai"].record(1.0, ok=False)
+    router.local_pending = 1
+
+    result = await router.transcribe_audio(audio_file, estimated_seconds=10.0)
+    assert result["backend"] == "local"
+    assert requests == []
+
+    # Once the cooldown has passed a probe request goes through again
+    monkeypatch.setattr(settings, "overflow_error_cooldown", 0.0)
+    router.local_pending = 1
+    result = await router.transcribe_audio(audio_file, estimated_seconds=10.0)
+    assert result["backend"] == "openai"
+    assert len(requests) == 1
+    await router.close()
+
+
+@pytest.mark.asyncio
+async def test_remote_concurrency_cap_keeps_work_local(
+    api_keys, audio_file, monkeypatch
+):
+    monkeypatch.setattr(settings, "overflow_queue_wait_threshold", 0.0)
+    monkeypatch.setattr(settings, "remote_transcription_concurrency", 1)
+    requests = []
+    remote = OpenAISpeechToText()
+    mock_client(remote, openai_handler(requests))
+    router = TranscriptionRouter(FakeLocal(), remote)
+    router.local_pending = 1
+    router.remote_pending = 1
+
+    result = await router.transcribe_audio(audio_file, estimated_seconds=10.0)
+
+    assert result["backend"] == "local"
+    assert requests == []
+    await router.close()